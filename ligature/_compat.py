@@ -7,7 +7,8 @@
 from __builtin__ import property
 
 from thread import get_ident as _get_ident
-import sys, operator
+import sys, operator, threading, time, functools
+from Queue import Queue
 
 
 __copyright__ = """Copyright (C) 2020 Corso Systems"""
@@ -17,39 +18,103 @@ __email__ = 'andrew.geiger@corsosystems.com'
 
 
 
-def memoize(function):
+_missing = object()
+
+
+class _HashedKey(list):
+    """Holds a memo key along with its hash, so it is only hashed once per call.
+    (Same idea as functools._HashedSeq in Python 3.)
+    """
+    __slots__ = ('hashvalue',)
+
+    def __init__(self, key):
+        self.hashvalue = hash(key) # raises TypeError for anything unhashable
+        self[:] = key
+
+    def __hash__(self):
+        return self.hashvalue
+
+
+def memoize(function=None, maxsize=None, ttl=None):
     """Memoize outputs.
     
-    This will leave the last values in the cache potentially,
-      so there's an implicit assumption that this is getting called
-      frequently.
+    Without a maxsize, every result is kept, so there's an implicit
+      assumption that there are only so many distinct calls.
+      Given one, the least recently used results are evicted first.
+    A ttl (in seconds) expires results that are older than that,
+      tracked in the memoized function's timeout table.
+    
+    Safe to call from several threads: if a result is already being
+      computed, other callers for the same arguments wait for it
+      (or its exception) instead of computing it again.
+    
+    >>> @memoize(maxsize=256, ttl=60)
+    ... def lookup(key): pass
+    >>> lookup.cache_info()['hits']
+    0
     """
+    if function is None:
+        return lambda function: memoize(function, maxsize, ttl)
+    
+    timeout = {}
+    cache = LRUCache(maxsize, onEvict=lambda key: timeout.pop(key, None))
+    inflight = {}
+    lock = threading.Lock()
+    
+    @functools.wraps(function)
     def memoized_call(*args, **kwargs):
         
-        memo_key = (args, tuple(
-                (k,v) for k,v in sorted(kwargs.items())
-              ))
-        
-        # in the event something unhashable was sent, this'll failsafe      
-        key_state = 0
+        # in the event something unhashable was sent, this'll failsafe
         try:
-            if memo_key not in memoized_call.cache:
-                key_state = 1
-            else:
-                key_state = 2
+            memo_key = _HashedKey((args, tuple(
+                    (k,v) for k,v in sorted(kwargs.items())
+                  )))
         except TypeError:
-            key_state = 0
-        
-        # failsafe or cache the result if needed...
-        if key_state == 0:
             return function(*args, **kwargs)
-        elif key_state == 1:
-            memoized_call.cache[memo_key] = function(*args, **kwargs)
-        # ... and return the result
-        return memoized_call.cache[memo_key]
+        
+        lock.acquire()
+        try:
+            expires = timeout.get(memo_key)
+            if expires is not None and expires <= time.time():
+                cache.discard(memo_key)
+            
+            value = cache.get(memo_key, _missing)
+            if value is not _missing:
+                return value
+            
+            task = inflight.get(memo_key)
+            computing = task is None
+            if computing:
+                task = inflight[memo_key] = PoolTask()
+        finally:
+            lock.release()
+        
+        # someone else is already on it
+        if not computing:
+            return task.result()
+        
+        try:
+            task._result = value = function(*args, **kwargs)
+        except:
+            task._error = sys.exc_info()
+            raise
+        finally:
+            lock.acquire()
+            try:
+                if task._error is None:
+                    if ttl is not None:
+                        timeout[memo_key] = time.time() + ttl
+                    cache.put(memo_key, value)
+                del inflight[memo_key]
+            finally:
+                lock.release()
+            task._done.set()
+        return value
     
-    memoized_call.cache = {}
-    memoized_call.timeout = {}
+    memoized_call.cache = cache
+    memoized_call.timeout = timeout
+    memoized_call.cache_info = lambda: cache.stats
+    memoized_call.cache_clear = cache.clear
     
     return memoized_call
 
@@ -352,3 +417,163 @@ class OrderedDict(dict):
 
     def __ne__(self, other):
         return not self == other
+
+
+
+class LRUCache(object):
+    """A bounded mapping that forgets the least recently used entries first.
+    Safe to share between threads, and it keeps count of how it is used.
+    """
+    __slots__ = ('maxsize', 'hits', 'misses', 'evictions', 'onEvict', '_entries', '_lock')
+
+    def __init__(self, maxsize=128, onEvict=None):
+        self.maxsize = maxsize
+        self.onEvict = onEvict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        self._lock.acquire()
+        try:
+            try:
+                value = self._entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            # most recently used entries are kept at the end
+            self._entries[key] = value
+            self.hits += 1
+            return value
+        finally:
+            self._lock.release()
+
+    def put(self, key, value):
+        self._lock.acquire()
+        try:
+            if key in self._entries:
+                del self._entries[key]
+            self._entries[key] = value
+            while self.maxsize is not None and len(self._entries) > self.maxsize:
+                evicted, _ = self._entries.popitem(last=False)
+                self._evicted(evicted)
+        finally:
+            self._lock.release()
+
+    def discard(self, key):
+        """Evict the entry early, if it is there."""
+        self._lock.acquire()
+        try:
+            if key in self._entries:
+                del self._entries[key]
+                self._evicted(key)
+        finally:
+            self._lock.release()
+
+    def _evicted(self, key):
+        self.evictions += 1
+        if self.onEvict:
+            self.onEvict(key)
+
+    def clear(self):
+        self._lock.acquire()
+        try:
+            for key in self._entries:
+                if self.onEvict:
+                    self.onEvict(key)
+            self._entries.clear()
+        finally:
+            self._lock.release()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+    def __repr__(self):
+        return '<LRUCache %d of %r entries (%d hits, %d misses, %d evictions)>' % (
+                    len(self._entries), self.maxsize, self.hits, self.misses, self.evictions)
+
+
+
+class PoolTask(object):
+    """The eventual result of a function handed to a ThreadPool."""
+    __slots__ = ('_done', '_result', '_error')
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def done(self):
+        return self._done.isSet()
+
+    def result(self, timeout=None):
+        """Wait for the function to finish, then return what it did (or raise what it raised)."""
+        self._done.wait(timeout)
+        if not self._done.isSet():
+            raise RuntimeError('Task did not finish in %r seconds' % timeout)
+        if self._error is not None:
+            raise self._error[0], self._error[1], self._error[2]
+        return self._result
+
+
+class ThreadPool(object):
+    """A minimal stand in for concurrent.futures.ThreadPoolExecutor,
+         which neither Python 2 nor Jython ship with.
+       Only submit and shutdown are provided.
+    """
+    __slots__ = ('maxWorkers', '_tasks', '_workers', '_shutdown')
+
+    def __init__(self, maxWorkers=4):
+        self.maxWorkers = maxWorkers
+        self._tasks = Queue()
+        self._workers = []
+        self._shutdown = False
+
+    def _work(self):
+        while True:
+            entry = self._tasks.get()
+            if entry is None: # poison pill from shutdown
+                return
+            task, function, args, kwargs = entry
+            try:
+                task._result = function(*args, **kwargs)
+            except:
+                task._error = sys.exc_info()
+            task._done.set()
+
+    def submit(self, function, *args, **kwargs):
+        if self._shutdown:
+            raise RuntimeError('Cannot submit to a ThreadPool after it shuts down')
+        # workers are only started as the work calls for them
+        if len(self._workers) < self.maxWorkers:
+            worker = threading.Thread(target=self._work)
+            worker.setDaemon(True)
+            worker.start()
+            self._workers.append(worker)
+        task = PoolTask()
+        self._tasks.put((task, function, args, kwargs))
+        return task
+
+    def shutdown(self, wait=True):
+        self._shutdown = True
+        for worker in self._workers:
+            self._tasks.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        self._workers = []
\ No newline at end of file
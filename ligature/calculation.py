@@ -3,12 +3,17 @@ from ligature.scanner import Scanner
 from ligature.recordset import RecordSet
 from ligature.record import genRecordType
 from ligature.expression import Expression
+from ligature.vectorize import vectorize as vectorizeFunction
+from ligature.combiner import Combiner
 from ligature.scanners.identity import Identity
+from ligature.scanners.batch import MultiFieldScanner
 
 
 def getArguments(function):
     if isinstance(function, Expression):
         return function._fields
+    elif isinstance(function, tuple) and all(isinstance(combiner, Combiner) for combiner in function):
+        return tuple(combiner.field for combiner in function)
     else:
         return function.__code__.co_varnames[:function.__code__.co_argcount]
 
@@ -16,11 +21,14 @@ def getArguments(function):
 class Calculation(Composable):
     """Base class for sweeping over RecordSets.
     """
-    __slots__ = ('function', '_mapInputs')
+    __slots__ = ('function', '_mapInputs', '_vectorized', '_argumentMap')
     
     ScanClass = Scanner
     
-    def __init__(self, sources, function, outputLabels, mapInputs={}, *args, **kwargs):
+    # Set if calculate() can run the function over whole columns (see ligature.vectorize)
+    Vectorizable = False
+    
+    def __init__(self, sources, function, outputLabels, mapInputs={}, vectorize=False, *args, **kwargs):
         # Initialize mixins
         super(Calculation, self).__init__(*args, **kwargs)
       
@@ -32,6 +40,12 @@ class Calculation(Composable):
             self.function = Expression(function)
         else:
             self.function = function
+        
+        # Opt in: falls back to row by row if the function (or NumPy) isn't up to it
+        if vectorize and self.Vectorizable:
+            self._vectorized = vectorizeFunction(self.function)
+        else:
+            self._vectorized = None
             
         self._mapInputs = mapInputs
         self._resolveSources()
@@ -40,27 +54,31 @@ class Calculation(Composable):
         """Sources is treated as a stack: last in, first out. 
         Thus if we have sources = (s1,s2), and both have column 'z',
           then we expect to resolve to s2's z
+        
+        If the ScanClass is Aligned, arguments read from the same RecordSet
+          share one MultiFieldScanner. The _argumentMap notes where each
+          argument is found: (scanner index, field index or None)
         """
-        scanners = []
+        resolved = [] # either a scanner, or the (source, column) to scan
         columns = [self._mapInputs.get(arg,arg) for arg in getArguments(self.function)]
         for column in columns:
             for source in reversed(self.sources):
                 if column is source:
-                    scanners.append(Identity(source))
+                    resolved.append(Identity(source))
                     break
 
                 if isinstance(source, (Composable, RecordSet)):
                     if isinstance(source, Composable):
-                        source = source.results
+                        source = source._resultset
                         
                     if column in source._RecordType._lookup:
-                        scanners.append(self.ScanClass(source, column))
+                        resolved.append((source, column))
                         source.subscribe(self)
                         break
                 else:
                     try:
                         _ = getattr(source, column)
-                        scanners.append(Identity(source, column))
+                        resolved.append(Identity(source, column))
                         break
                     except:
                         pass
@@ -68,11 +86,45 @@ class Calculation(Composable):
             else: # should not complete loop - a column must be found and break!
                 raise ValueError('Column "%s" not found in sources!' % column) #' \n\t%s' % (column, '\n\t'.join('{%s}' % s._lookup.keys() for s in reversed(self.sources)))
 
+        # gather the fields each source is read for
+        sharedFields = {}
+        if self.ScanClass.Aligned:
+            for entry in resolved:
+                if isinstance(entry, tuple):
+                    fields = sharedFields.setdefault(id(entry[0]), [])
+                    if not entry[1] in fields:
+                        fields.append(entry[1])
+
+        scanners = []
+        argumentMap = []
+        multiScanners = {}
+        for entry in resolved:
+            if isinstance(entry, tuple):
+                source, column = entry
+                fields = sharedFields.get(id(source), ())
+                if len(fields) > 1:
+                    if not id(source) in multiScanners:
+                        multiScanners[id(source)] = len(scanners)
+                        scanners.append(MultiFieldScanner(source, fields))
+                    argumentMap.append((multiScanners[id(source)], fields.index(column)))
+                    continue
+                entry = self.ScanClass(source, column)
+            argumentMap.append((len(scanners), None))
+            scanners.append(entry)
+
         self.scanners = tuple(scanners)
+        self._argumentMap = tuple(argumentMap)
+
+    def _arguments(self, values):
+        """Arrange what the scanners gave (one entry each) into the function's arguments."""
+        return [values[scannerIx] if fieldIx is None else values[scannerIx][fieldIx]
+                for scannerIx, fieldIx
+                in self._argumentMap]
 
     def _apply(self):
         self.calculate()
-        self._needsUpdate = False
+        self._awaiting_apply = False
+        self._up_to_date = True
             
     def _default_graph_attributes(self):
         label = 'In: %s\\lf(x): "%s"\\lOut: %s' % (
@@ -1,4 +1,4 @@
 from ligature.calculations.sweep import Sweep
 from ligature.calculations.cluster import Cluster
 from ligature.calculations.window import Window
-from ligature.calculations.aggregate import Aggregate
+from ligature.calculations.aggregate import Aggregate, IncrementalAggregate
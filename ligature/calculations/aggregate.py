@@ -1,5 +1,8 @@
 from ligature.calculation import Calculation
 from ligature.scanners.element import ElementScanner
+from ligature.scanners.chunk import ChunkScanner
+
+from itertools import izip as zip
 
 
 class Aggregate(Calculation):
@@ -20,4 +23,54 @@ class Aggregate(Calculation):
         
         self._resultset.clear()
         
-        self._resultset.append( (self.function(*self.scanners),) )
\ No newline at end of file
+        self._resultset.append( (self.function(*self.scanners),) )
+
+
+class IncrementalAggregate(Aggregate):
+    """Aggregates with combiners (see ligature.combiner) instead of a function.
+       Each combiner keeps a running state, so only the groups delivered
+       since the last apply get folded in, not the whole history.
+    """
+    __slots__ = ('_states',)
+    
+    ScanClass = ChunkScanner
+    
+    def __init__(self, sources, combiners, outputLabels, *args, **kwargs):
+        self._states = None
+        super(IncrementalAggregate, self).__init__(sources, tuple(combiners), outputLabels, *args, **kwargs)
+    
+    def clear(self):
+        self._states = None
+        super(IncrementalAggregate, self).clear()
+    
+    def _checkpointState(self):
+        return None if self._states is None else list(self._states)
+    
+    def _restoreState(self, state):
+        self._states = state
+    
+    def calculate(self):
+        """Fold the new groups into each combiner's state, replacing the one result.
+        Sum(a), Max(b)
+        rs.a = [(1,2,3,4),(5,6),(7,8,9)]  = 45
+        rs.b = [(0,1,0,1),(0,1),(0,1,0)]  = 1
+        calc = [(45,1)]                   # 1 group of 1
+        """
+        if self._states is None:
+            self._states = [combiner.initial() for combiner in self.function]
+        
+        # each combiner only depends on its own field, so the scanners need not be aligned
+        folded = False
+        for ix, (combiner, scanner) in enumerate(zip(self.function, self.scanners)):
+            state = self._states[ix]
+            for chunk in scanner:
+                state = combiner.fold(state, chunk)
+                folded = True
+            self._states[ix] = state
+        
+        if folded or not self._resultset._groups:
+            self._resultset.clear()
+            self._resultset.append( (self._resultset._RecordType._make(tuple(
+                combiner.result(state)
+                for combiner, state
+                in zip(self.function, self._states) )),) )
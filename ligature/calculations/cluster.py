@@ -1,11 +1,15 @@
 from ligature.calculation import Calculation
 from ligature.scanners.chunk import ChunkScanner
 
+from itertools import starmap
+
 
 class Cluster(Calculation):
     
     ScanClass = ChunkScanner
     
+    Vectorizable = True
+    
     # By group's records
     def calculate(self):
         """For each group, run the function by row, keeping grouping.
@@ -15,10 +19,16 @@ class Cluster(Calculation):
         rs.b = [(0,1,0,1),(0,1),(0,1,0)]
         calc = [(1,3,3,5),(5,7),(7,9,9)] # 3 groups
         """
-        self._resultset.extend(
-            [ tuple( self.function(*rowValues)
-                     for rowValues 
-                     in zip(*groupedValues) )
-             for groupedValues 
-             in zip(*self.scanners)
-            ])
\ No newline at end of file
+        if self._vectorized:
+            self._resultset.extend(
+                [ self._vectorized(*groupedValues)
+                 for groupedValues
+                 in zip(*self.scanners)
+                ])
+        else:
+            # groups already arrive as whole chunks, so map the function over each
+            self._resultset.extend(
+                [ list(starmap(self.function, zip(*groupedValues)))
+                 for groupedValues 
+                 in zip(*self.scanners)
+                ])
\ No newline at end of file
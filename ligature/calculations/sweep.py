@@ -1,10 +1,12 @@
 from ligature.calculation import Calculation
-from ligature.scanners.element import ElementScanner
+from ligature.scanners.batch import BatchScanner, alignedBatches
 
 
 class Sweep(Calculation):
     
-    ScanClass = ElementScanner
+    ScanClass = BatchScanner
+    
+    Vectorizable = True
    
     # Record by record
     def calculate(self):
@@ -16,6 +18,20 @@ class Sweep(Calculation):
         rs.b = [(0,1,0,1),(0,1),(0,1,0)]
         calc = [(1,3,3,5,5,7,7,9,9)]     # 1 group of 9
         """
-        self._resultset.append(self.function(*values)
-                               for values 
-                               in zip(*self.scanners))
\ No newline at end of file
+        if any(scanner.Aligned for scanner in self.scanners):
+            # a run of values at a time, rather than a zip step per row
+            results = []
+            for batches in alignedBatches(self.scanners):
+                columns = self._arguments(batches)
+                if self._vectorized:
+                    results.extend(self._vectorized(*columns))
+                else:
+                    results.extend(map(self.function, *columns))
+            self._resultset.append(results)
+        elif self._vectorized:
+            columns = zip(*zip(*self.scanners))
+            self._resultset.append(self._vectorized(*columns) if columns else [])
+        else:
+            self._resultset.append(self.function(*values)
+                                   for values 
+                                   in zip(*self.scanners))
\ No newline at end of file
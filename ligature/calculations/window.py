@@ -7,6 +7,9 @@ class Window(Sweep, Calculation):
 
     ScanClass = ChunkScanner
     
+    # Functions here take whole chunks, not elements
+    Vectorizable = False
+    
     def calculate(self):
         """Run the aggregate function by group creating one new group.
            If groups don't matter after windowing, this is easiest.
@@ -0,0 +1,91 @@
+"""
+    Save and restore the progress of a composition graph
+
+    A checkpoint holds the contents of every RecordSet in the graph and
+      where each scanner had read up to, as plain values. Restored into
+      the same graph (built the same way) after a restart, each Composable
+      picks up where it left off, instead of calculating all of its
+      history over again.
+"""
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from ligature.recordset import RecordSet
+from ligature.view import RecordSetView
+from ligature.scheduler import topologicalOrder
+
+
+__copyright__ = """Copyright (C) 2020 Corso Systems"""
+__license__ = 'Apache 2.0'
+__maintainer__ = 'Andrew Geiger'
+__email__ = 'andrew.geiger@corsosystems.com'
+
+__all__ = ['checkpoint', 'restore', 'save', 'load']
+
+
+def graphOf(composables):
+    """Returns the RecordSets (and views) feeding the graph and its Composables, sources first.
+    The order only depends on how the graph is built, so it lines up across restarts.
+    """
+    nodes = topologicalOrder(composables)
+    recordSets = []
+    for node in nodes:
+        for source in node.sources:
+            if not isinstance(source, RecordSet):
+                continue
+            # a view only holds its bounds, so the RecordSet it views comes first
+            #   (unless it is a Composable's results, which the Composable keeps)
+            if isinstance(source, RecordSetView):
+                viewed = source._source
+                if not any(viewed is seen for seen in recordSets + [n._resultset for n in nodes]):
+                    recordSets.append(viewed)
+            if not any(source is seen for seen in recordSets):
+                recordSets.append(source)
+    return recordSets, nodes
+
+
+def checkpoint(*composables):
+    """The state of the composables and everything upstream of them."""
+    recordSets, nodes = graphOf(composables)
+    return {
+        'recordsets': [recordSet.checkpoint() for recordSet in recordSets],
+        'composables': [(type(node).__name__, node.checkpoint()) for node in nodes],
+    }
+
+
+def restore(state, *composables):
+    """Put the graph back the way the checkpoint found it.
+    The graph must be built the same way it was when checkpointed.
+    """
+    recordSets, nodes = graphOf(composables)
+    if (   len(recordSets) != len(state['recordsets'])
+        or [type(node).__name__ for node in nodes] != [name for name, _ in state['composables']]):
+        raise ValueError('The checkpoint is for a different graph.')
+
+    # sources first, so the scanners reading them line up
+    for recordSet, recordSetState in zip(recordSets, state['recordsets']):
+        recordSet.restore(recordSetState)
+    for node, (_, nodeState) in zip(nodes, state['composables']):
+        node.restore(nodeState)
+
+
+def save(path, *composables):
+    """Write a checkpoint of the graph to the file at path."""
+    stream = open(path, 'wb')
+    try:
+        pickle.dump(checkpoint(*composables), stream, pickle.HIGHEST_PROTOCOL)
+    finally:
+        stream.close()
+
+
+def load(path, *composables):
+    """Restore the graph from the checkpoint saved at path."""
+    stream = open(path, 'rb')
+    try:
+        state = pickle.load(stream)
+    finally:
+        stream.close()
+    restore(state, *composables)
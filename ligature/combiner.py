@@ -0,0 +1,163 @@
+"""
+    Associative combiners for incremental aggregates
+
+    A combiner folds values into a small running state, so an aggregate
+      only has to consume what is new instead of the whole history.
+      States can also be merged, in any grouping, with the same result.
+"""
+
+
+__copyright__ = """Copyright (C) 2020 Corso Systems"""
+__license__ = 'Apache 2.0'
+__maintainer__ = 'Andrew Geiger'
+__email__ = 'andrew.geiger@corsosystems.com'
+
+__all__ = ['Combiner', 'Sum', 'Count', 'Min', 'Max', 'Mean', 'Variance']
+
+
+class Combiner(object):
+    """Reduces the values of one field to a single result.
+    Subclasses define the state kept between folds.
+    """
+    __slots__ = ('field',)
+
+    def __init__(self, field):
+        self.field = field
+
+    def initial(self):
+        """The state before any values are folded in."""
+        raise NotImplementedError("Combiners must define their initial state.")
+
+    def fold(self, state, values):
+        """Returns the state after folding in a chunk of values."""
+        raise NotImplementedError("Combiners must define how values are folded in.")
+
+    def merge(self, state, other):
+        """Returns the state covering the values of both states."""
+        raise NotImplementedError("Combiners must define how states are merged.")
+
+    def result(self, state):
+        return state
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.field)
+
+
+class Sum(Combiner):
+
+    def initial(self):
+        return 0
+
+    def fold(self, state, values):
+        return state + sum(values)
+
+    def merge(self, state, other):
+        return state + other
+
+
+class Count(Combiner):
+
+    def initial(self):
+        return 0
+
+    def fold(self, state, values):
+        return state + len(values)
+
+    def merge(self, state, other):
+        return state + other
+
+
+class Min(Combiner):
+    """The state is None until a value is seen."""
+
+    def initial(self):
+        return None
+
+    def fold(self, state, values):
+        if not values:
+            return state
+        return self.merge(state, min(values))
+
+    def merge(self, state, other):
+        if state is None:
+            return other
+        if other is None:
+            return state
+        return min(state, other)
+
+
+class Max(Min):
+
+    def fold(self, state, values):
+        if not values:
+            return state
+        return self.merge(state, max(values))
+
+    def merge(self, state, other):
+        if state is None:
+            return other
+        if other is None:
+            return state
+        return max(state, other)
+
+
+class Mean(Combiner):
+    """Keeps the count and total. The result is None until a value is seen."""
+
+    def initial(self):
+        return (0, 0)
+
+    def fold(self, state, values):
+        count, total = state
+        return (count + len(values), total + sum(values))
+
+    def merge(self, state, other):
+        return (state[0] + other[0], state[1] + other[1])
+
+    def result(self, state):
+        count, total = state
+        if not count:
+            return None
+        return total / float(count)
+
+
+class Variance(Combiner):
+    """Keeps the count, mean and sum of squared differences (M2).
+    Values are folded in with Welford's algorithm, and states are
+      merged with Chan et al's pairwise update, so the result stays
+      accurate no matter how long the history gets.
+    """
+    __slots__ = ('sample',)
+
+    def __init__(self, field, sample=True):
+        super(Variance, self).__init__(field)
+        self.sample = sample
+
+    def initial(self):
+        return (0, 0.0, 0.0)
+
+    def fold(self, state, values):
+        count, mean, m2 = state
+        for value in values:
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+        return (count, mean, m2)
+
+    def merge(self, state, other):
+        count_a, mean_a, m2_a = state
+        count_b, mean_b, m2_b = other
+        count = count_a + count_b
+        if not count:
+            return self.initial()
+        delta = mean_b - mean_a
+        mean = mean_a + delta * count_b / count
+        m2 = m2_a + m2_b + delta * delta * count_a * count_b / count
+        return (count, mean, m2)
+
+    def result(self, state):
+        count, mean, m2 = state
+        if count < (2 if self.sample else 1):
+            return None
+        return m2 / (count - 1 if self.sample else count)
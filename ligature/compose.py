@@ -40,7 +40,7 @@ class Composable(UpdateModel):
             # Only the previous would have over-emitted.
             if scanner.exhausted:
                 break
-            else:
+            elif not scanner.Aligned:
                 scanner.rewind()
                 
     def _update_first(function):
@@ -66,6 +66,55 @@ class Composable(UpdateModel):
     def records(self):
         return self.results.records
 
+    @property
+    def _offsets(self):
+        return self.results._offsets
+
+    @property
+    def _removedRecords(self):
+        return self._resultset._removedRecords
+
+    @property
+    def _removedGroups(self):
+        return self._resultset._removedGroups
+
+    @property
+    def record_count(self):
+        return self.results.record_count
+
+    def range(self, field, lo=None, hi=None):
+        return self.results.range(field, lo, hi)
+
+    def requiredFields(self, source):
+        """The fields this reads from the source, or None if it may need any of them.
+           By default, this is whatever the scanners on the source read.
+        """
+        sourceSet = source._resultset if isinstance(source, Composable) else source
+        fields = set()
+        for scanner in self.scanners:
+            if scanner.source is source or scanner.source is sourceSet:
+                fieldIxs = getattr(scanner, '_field_indexes', None)
+                if fieldIxs is None:
+                    fieldIxs = (getattr(scanner, '_field_index', None),)
+                if None in fieldIxs:
+                    return None
+                fields.update(sourceSet._RecordType._fields[fieldIx] for fieldIx in fieldIxs)
+        return fields
+
+    def project(self, fields):
+        """Narrow the results to only the given fields, if this is able to.
+           Only possible before any results are made. Returns True if the results changed.
+        """
+        return False
+
+    @property
+    def _lock(self):
+        return self._resultset._lock
+
+    def _attachScanner(self, scanner):
+        """Scanners on a Composable read its results, so that is who they need to ask."""
+        self._resultset._attachScanner(scanner)
+
     def __getitem__(self, selector):
         return self.results[selector]
 
@@ -86,6 +135,34 @@ class Composable(UpdateModel):
         self._awaiting_apply = True
 
 
+    def checkpoint(self):
+        """The results, scanner cursors and any other progress, as plain values (see restore).
+           The upstream graph is not included (see ligature.checkpoint for that).
+        """
+        return {
+            'results': self._resultset.checkpoint(),
+            'scanners': [scanner.checkpoint() for scanner in self.scanners],
+            'state': self._checkpointState(),
+            'awaiting': self._awaiting_apply,
+        }
+
+    def restore(self, state):
+        """Pick up where the checkpoint left off. Sources should be restored first."""
+        if len(state['scanners']) != len(self.scanners):
+            raise ValueError('Checkpoint has %d scanners, but %d are in use' % (len(state['scanners']), len(self.scanners)))
+        self._resultset.restore(state['results'])
+        for scanner, scannerState in zip(self.scanners, state['scanners']):
+            scanner.restore(scannerState)
+        self._restoreState(state['state'])
+        self._awaiting_apply = state['awaiting']
+
+    def _checkpointState(self):
+        """Whatever else a Composable carries between applies."""
+        return None
+
+    def _restoreState(self, state):
+        pass
+
     # This allows us to better control how the graph is followed
     def _replace_sources(self, newSources):
         for source in set(self._sources).difference(set(newSources)):
@@ -118,13 +195,18 @@ class Composable(UpdateModel):
         
         super(Composable, self).update(old_selector, new_selector, source or self, depth)
           
-    def apply(self):
-        for source in self.sources:
-            if isinstance(source, Composable):
-                source.apply()
-        if self._awaiting_apply:
-            self._apply()
-        self._debounce_scanners()
+    def apply(self, executor=None):
+        """Bring this up to date, along with everything upstream of it.
+           Each node in the graph is applied once, sources first (see ligature.scheduler).
+           With an executor, independent branches are applied concurrently.
+        """
+        from ligature.scheduler import Scheduler
+        return Scheduler(self, executor=executor).run()
+        
+    def stream(self, ingestor=None, timeout=None, executor=None):
+        """Iterate the result groups as they are made (see ligature.stream.resultGroups)."""
+        from ligature.stream import resultGroups
+        return resultGroups(self, ingestor, timeout, executor)
         
     def _apply(self):
         raise NotImplementedError("The base composable class' apply() must be overridden.")
@@ -3,12 +3,17 @@
 """
 
 import __builtin__
+import __future__
+import sys
 import operator as op
 import tokenize
+import keyword
+import ast
 from ast import literal_eval
 from StringIO import StringIO
 
 from ligature.enum import MetaEnum, Enum
+from ligature._compat import LRUCache
 
 
 __copyright__ = """Copyright (C) 2020 Corso Systems"""
@@ -278,11 +283,56 @@ whitelisted_modules = set((
 ))
 
 
+# Modules that get reloaded while running (like Ignition's shared scripts),
+#   so compiled expressions look up their attributes on each call.
+reloadable_modules = set((
+    'shared',
+))
+
+
 whitelisted_builtins = set((
     'max','min'
 ))
 
 
+# Operators that Python's own syntax does exactly the same as the functions above
+#   (the overloads for '+', '-' and '*' are what the plain operators already do for two arguments)
+native_binary_operators = {
+    '+' : ast.Add,
+    '-' : ast.Sub,
+    '*' : ast.Mult,
+    '/' : ast.Div, # compiled with true division, see PEP 238
+    '//': ast.FloorDiv,
+    '%' : ast.Mod,
+    '**': ast.Pow,
+    '<<': ast.LShift,
+    '>>': ast.RShift,
+    '&' : ast.BitAnd, 'and': ast.BitAnd,
+    '|' : ast.BitOr,  'or' : ast.BitOr,
+    '^' : ast.BitXor,
+}
+
+native_comparison_operators = {
+    '<' : ast.Lt,
+    '<=': ast.LtE,
+    '==': ast.Eq,
+    '!=': ast.NotEq,
+    '>=': ast.GtE,
+    '>' : ast.Gt,
+    'is': ast.Is,
+}
+
+
+# Parsed expressions by their source text: (postfix stack, fields, compiled function)
+#   Compiled functions hold no state, so every Expression of the same text can share one.
+#   (They look up reloadable modules' attributes when called, so reloads still show.)
+expression_cache = LRUCache(maxsize=512)
+
+
+class MalformedExpression(SyntaxError):
+    """The expression can not be read as a single value (or uses unsupported keywords)."""
+
+
 class REF_TYPE(Enum):
     CONSTANT = -2
     ARGUMENT = -4
@@ -292,18 +342,171 @@ class REF_TYPE(Enum):
 
 class Expression(object):
     
-    __slots__ = ('_fields', '_eval_func',
+    __slots__ = ('_fields', '_eval_func', '_postfix',
                  '_arguments', '_constants', '_functions', '_externals'
                 )
     
     def __init__(self, expression):
-        if isinstance(expression, str):
+        if isinstance(expression, basestring):
+            cached = expression_cache.get(expression)
+            if cached:
+                self._postfix, self._fields, self._eval_func = cached
+                # lambdas are bound to their instance, so those can't be shared
+                if self._eval_func is None:
+                    self._resolve_function(self._postfix)
+                return
             # convert the expression to something we can resolve reliably
             postfixStack = convert_to_postfix(expression)
-            # ... and map it to the properties here
-            self._resolve_function(postfixStack)
         else:
-            self._resolve_function(expression)
+            postfixStack = expression
+        # keep the stack so the expression can be evaluated other ways (see ligature.vectorize)
+        self._postfix = tuple(postfixStack)
+        # ... and map it to the properties here, preferably as one flat function
+        try:
+            self._compile_function(self._postfix)
+            compiled = self._eval_func
+        except MalformedExpression:
+            # the fallback would quietly misread it too
+            raise
+        except (SyntaxError, TypeError, ValueError, AttributeError, 
+                IndexError, KeyError, NotImplementedError):
+            self._resolve_function(self._postfix)
+            compiled = None
+        
+        if isinstance(expression, basestring):
+            expression_cache.put(expression, (self._postfix, self._fields, compiled))
+        
+    def _compile_function(self, postfixStack):
+        """Generate a single Python function from the postfix stack.
+        Evaluation is then one frame working on local variables, instead
+          of a tree of lambdas indexing into the reference lists.
+        Only the whitelisted modules, builtins and operator functions
+          are reachable from the generated function.
+        """
+        references = {}
+        names = [] # in order of appearance...
+        valueNames = set() # ... and the ones that turned out to be arguments, not attributes
+        opstack = []
+        
+        def reference(obj):
+            name = '__ref%d' % len(references)
+            references[name] = obj
+            return ast.Name(name, ast.Load())
+        
+        def value(entry):
+            kind, item = entry
+            if kind == 'name':
+                valueNames.add(item)
+                return ast.Name(item, ast.Load())
+            elif kind == 'tuple':
+                return ast.Tuple(item, ast.Load())
+            elif kind == 'module':
+                return reference(item)
+            else:
+                return item
+            
+        def moduleAttribute(module, attribute):
+            function = getattr(module, attribute)
+            if module.__name__ in reloadable_modules:
+                # the module itself may be replaced on reload, so it is found again too
+                loaded = ast.Subscript(reference(sys.modules), ast.Index(ast.Str(module.__name__)), ast.Load())
+                return ast.Attribute(loaded, attribute, ast.Load())
+            return reference(function)
+            
+        def elements(entry):
+            if entry[0] == 'tuple':
+                return entry[1]
+            else:
+                return [value(entry)]
+        
+        for tokenType,token in postfixStack:
+            
+            if tokenType == tokenize.OP:
+                
+                if token == '.':
+                    (nameKind, attribute), operand = opstack.pop(), opstack.pop()
+                    if not nameKind == 'name':
+                        raise AttributeError('Expected an attribute name, but got %r' % (attribute,))
+                    
+                    # math.pi
+                    if operand[0] == 'module':
+                        opstack.append( ('value', moduleAttribute(operand[1], attribute)) )
+                    # math.sin(x) comes through as math, x, sin, .
+                    elif opstack and opstack[-1][0] == 'module' and isCallable(getattr(opstack[-1][1], attribute, None)):
+                        module = opstack.pop()[1]
+                        opstack.append( ('value', ast.Call(moduleAttribute(module, attribute), 
+                                                           elements(operand), [], None, None)) )
+                    # x.real
+                    else:
+                        opstack.append( ('value', ast.Attribute(value(operand), attribute, ast.Load())) )
+                
+                elif token in one_argument_operators:
+                    operand = opstack.pop()
+                    opstack.append( ('value', ast.UnaryOp(ast.Not(), value(operand))) )
+                
+                else:
+                    right, left = opstack.pop(), opstack.pop()
+                    
+                    if token == ',':
+                        opstack.append( ('tuple', elements(left) + [value(right)]) )
+                    
+                    # backwards, just like the operator function
+                    elif token == '__getitem__':
+                        opstack.append( ('value', ast.Subscript(value(right), ast.Index(value(left)), ast.Load())) )
+                    
+                    elif token in native_binary_operators:
+                        opstack.append( ('value', ast.BinOp(value(left), native_binary_operators[token](), value(right))) )
+                    
+                    elif token in native_comparison_operators:
+                        opstack.append( ('value', ast.Compare(value(left), [native_comparison_operators[token]()], [value(right)])) )
+                    
+                    elif token in two_argument_operators:
+                        opstack.append( ('value', ast.Call(reference(two_argument_operators[token]), 
+                                                           [value(left), value(right)], [], None, None)) )
+                    else:
+                        raise NotImplementedError('Operator "%s" can not be compiled' % token)
+            
+            elif tokenType == tokenize.NAME:
+                if token in whitelisted_modules:
+                    opstack.append( ('module', __import__(token)) )
+                
+                elif token in whitelisted_builtins:
+                    operand = opstack.pop()
+                    opstack.append( ('value', ast.Call(reference(getattr(__builtin__, token)), 
+                                                       [value(operand)], [], None, None)) )
+                elif keyword.iskeyword(token):
+                    raise MalformedExpression('"%s" is not supported in expressions' % token)
+                else:
+                    if not token in names:
+                        names.append(token)
+                    opstack.append( ('name', token) )
+            
+            elif tokenType == tokenize.NUMBER:
+                opstack.append( ('value', ast.Num(literal_eval(token))) )
+            
+            elif tokenType == tokenize.STRING:
+                opstack.append( ('value', ast.Str(str(token))) )
+        
+        # anything more (or less) than one value left means the expression was not understood
+        if len(opstack) != 1:
+            raise MalformedExpression('Expression does not resolve to a single value')
+        body = value(opstack.pop())
+        fields = tuple(name for name in names if name in valueNames)
+        if set(fields).intersection(references):
+            raise ValueError('Argument names collide with the generated references: %r' % (fields,))
+        
+        # extra arguments are ignored, like before
+        arguments = ast.arguments([ast.Name(field, ast.Param()) for field in fields], '__extra', None, [])
+        module = ast.Module([ast.FunctionDef('expression', arguments, [ast.Return(body)], [])])
+        ast.fix_missing_locations(module)
+        
+        code = compile(module, '<expression>', 'exec', __future__.division.compiler_flag, True)
+        namespace = dict(references)
+        namespace['__builtins__'] = {}
+        exec code in namespace
+        
+        self._fields = fields
+        self._eval_func = namespace['expression']
         
     def _resolve_function(self, postfixStack):
         
@@ -501,18 +704,23 @@ class Expression(object):
         
         opType,opIx = opstack.pop()
         if opType in (REF_TYPE.CONSTANT, REF_TYPE.ARGUMENT):
-            self._eval_func = lambda: references[opType][opIx]
+            evaluate = lambda: references[opType][opIx]
         else:
-            self._eval_func = references[opType][opIx]
+            evaluate = references[opType][opIx]
+        
+        # the lambdas read from the argument list, so load it before each evaluation
+        arguments = self._arguments
+        def load_and_evaluate(*args):
+            arguments[:] = args
+            return evaluate()
+        self._eval_func = load_and_evaluate
 
 
     def __call__(self, *args, **kwargs):
         if kwargs:
-            self._arguments[:] = [kwargs.get(field) or args[i] for i,field  in enumerate(self._fields)]
-        else:
-            self._arguments[:] = args
+            args = [kwargs.get(field) or args[i] for i,field  in enumerate(self._fields)]
         
-        if len(self._arguments) < len(self._fields):
+        if len(args) < len(self._fields):
             raise TypeError('Expression takes exactly %d argument%s: %r (%d given)' % (
-                                len(self._fields), 's' if len(self._fields) > 1 else '', list(self._fields), len(self._arguments)))     
-        return self._eval_func()    
+                                len(self._fields), 's' if len(self._fields) > 1 else '', list(self._fields), len(args)))     
+        return self._eval_func(*args)    
@@ -0,0 +1,76 @@
+"""
+    Push column projections up the composition graph
+
+    Transforms like Merge, Feed and Collation build full width records,
+      even when whatever reads them only needs a few of the fields.
+      Once the graph is built (and before it runs), pushdown walks it
+      from the consumers back to the sources, narrowing each result
+      to the fields something downstream actually reads.
+"""
+
+from ligature.compose import Composable
+from ligature.scheduler import topologicalOrder
+
+
+__copyright__ = """Copyright (C) 2020 Corso Systems"""
+__license__ = 'Apache 2.0'
+__maintainer__ = 'Andrew Geiger'
+__email__ = 'andrew.geiger@corsosystems.com'
+
+__all__ = ['pushdown', 'neededFields']
+
+
+def consumersOf(composable):
+    """Everything listening to the composable's results."""
+    return list(composable._resultset.listeners)
+
+
+def neededFields(composable):
+    """Returns the fields of the composable's results that its consumers read.
+    If it can't be sure (like when nothing reads it yet, or a consumer
+      is not a Composable that can resolve its scanners again), None is returned.
+    """
+    consumers = consumersOf(composable)
+    if not consumers:
+        return None
+    fields = set()
+    for consumer in consumers:
+        if not (isinstance(consumer, Composable) and hasattr(consumer, '_resolveSources')):
+            return None
+        required = consumer.requiredFields(composable)
+        if required is None:
+            return None
+        fields.update(required)
+    return fields or None
+
+
+def pushdown(*composables):
+    """Narrow the results of the composables (and everything upstream of them)
+         to just the fields their consumers need.
+       Consumers of anything narrowed resolve their sources again.
+       Returns the composables that were narrowed.
+    """
+    # order the graph so consumers come before their sources
+    ordered = topologicalOrder(composables)
+    ordered.reverse()
+
+    # consumers first, so they have already narrowed what they read
+    narrowed = []
+    for composable in ordered:
+        fields = neededFields(composable)
+        if fields is not None and composable.project(fields):
+            narrowed.append(composable)
+
+    stale = []
+    for composable in narrowed:
+        for consumer in consumersOf(composable):
+            if not consumer in stale:
+                stale.append(consumer)
+
+    # sources first, so each resolves against results that are already final
+    position = dict((composable, ix) for ix, composable in enumerate(reversed(ordered)))
+    stale.sort(key=lambda consumer: position.get(consumer, len(position)))
+    for consumer in stale:
+        consumer._resolveSources()
+
+    return narrowed
\ No newline at end of file
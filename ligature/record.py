@@ -1,7 +1,7 @@
 from itertools import izip as zip
-import re
-
-from ligature._compat import memoize
+from operator import itemgetter
+from weakref import WeakValueDictionary
+import re, threading
 
 try:
     from com.inductiveautomation.ignition.common import BasicDataset
@@ -27,12 +27,30 @@ class RecordType(object):
     _reprString = '<Record {%s}>' % (', '.join("'%s'=%%r" % f for f in _fields),)
 
     def __init__(self, values):
-        if isinstance(values, dict):
-            self._tuple = tuple(values.get(field) for field in self._fields)
-        else:
-            self._tuple = self._cast(values)
+        self._tuple = self._coerceTuple(values)
         assert len(self._tuple) == len(self._fields), 'Expected %d args, but got %d' % (len(self._fields), len(self._tuple))
             
+    @classmethod
+    def _make(cls, values):
+        """Wrap an already-cast tuple of values without re-validating it.
+        Used by group storage to materialize records on demand.
+        """
+        record = cls.__new__(cls)
+        record._tuple = values
+        return record
+
+    @classmethod
+    def _coerceTuple(cls, values):
+        """Return the backing tuple a record of this type would hold for the values.
+        This lets group storage skip building a record just to get its tuple.
+        """
+        if isinstance(values, RecordType):
+            return values._tuple
+        elif isinstance(values, dict):
+            return tuple(values.get(field) for field in cls._fields)
+        else:
+            return cls._cast(values)
+
     def _asdict(self):
         return dict(zip(self._fields, self))
     
@@ -40,6 +58,17 @@ class RecordType(object):
     def getGetter(cls, field):
         ix = cls._lookup[field]
         return lambda myself, ix=ix: myself._tuple[ix]
+
+    @classmethod
+    def getTupleGetter(cls, *fields):
+        """Returns an itemgetter for the fields, to use on the records' backing tuples.
+        This runs entirely in C, so it is the fast way to pull values in bulk.
+        Given several fields, each call returns a tuple of their values.
+        >>> R = genRecordType('abc')
+        >>> R.getTupleGetter('c', 'a')((1,2,3))
+        (3, 1)
+        """
+        return itemgetter(*[cls._lookup[field] for field in fields])
     
     @classmethod
     def keys(cls):
@@ -98,7 +127,13 @@ class RecordType(object):
         pass
         
 
-@memoize
+# Generated classes are kept only while something (like a record or RecordSet)
+#   still uses them, so the same header gets the same class for as long as it
+#   matters for isinstance checks, without every header ever seen piling up.
+_recordTypes = WeakValueDictionary()
+_recordTypesLock = threading.Lock()
+
+
 def genRecordType(header, BaseRecordType=RecordType, scalar_tuples=False):
     """Returns something like a namedtuple. 
     Designed to have lightweight instances while having many convenient ways
@@ -109,6 +144,23 @@ def genRecordType(header, BaseRecordType=RecordType, scalar_tuples=False):
     else:
         rawFields = tuple(h for h in header)    
 
+    key = (rawFields, BaseRecordType, scalar_tuples)
+    try:
+        hash(key)
+    except TypeError:
+        return _buildRecordType(rawFields, BaseRecordType, scalar_tuples)
+
+    _recordTypesLock.acquire()
+    try:
+        Record = _recordTypes.get(key)
+        if Record is None:
+            Record = _recordTypes[key] = _buildRecordType(rawFields, BaseRecordType, scalar_tuples)
+        return Record
+    finally:
+        _recordTypesLock.release()
+
+
+def _buildRecordType(rawFields, BaseRecordType, scalar_tuples):
     numericFieldPrefix = 'C'
     unsafePattern = re.compile('[^a-zA-Z0-9_]')
     try:
@@ -145,8 +197,8 @@ def genRecordType(header, BaseRecordType=RecordType, scalar_tuples=False):
         setattr(Record, key, property(lambda self, ix=ix: self._tuple[ix]))
         
     if len(Record._fields) == 1 and not scalar_tuples:
-        setattr(Record, '_cast', lambda self,v: (v,))
+        setattr(Record, '_cast', staticmethod(lambda v: (v,)))
     else:
-        setattr(Record, '_cast', lambda self,v: tuple(v))
+        setattr(Record, '_cast', staticmethod(lambda v: tuple(v)))
         
     return Record
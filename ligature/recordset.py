@@ -1,10 +1,14 @@
+from __future__ import with_statement
+
 from ligature.record import RecordType, genRecordType
 from ligature.update import UpdateModel
+from ligature.storage import Group, groupColumn, groupRows
 # from ligature.graph import GraphModel
 
-import functools, math
+import functools, math, threading
 from itertools import izip as zip
 from itertools import islice
+from bisect import bisect_left, bisect_right
 
 from weakref import WeakSet
 
@@ -24,11 +28,12 @@ class RecordSetColumn(object):
         self._source = recordSet
         self._index = columnIndex
 
+    def _iterColumn(self, group):
+        return iter(groupColumn(group, self._index))
+
     def __iter__(self):
         """Redirect to the tuple stored when iterating."""
-        return ((record._tuple[self._index]
-                  for record 
-                  in group)
+        return (self._iterColumn(group)
                 for group in self._source._groups)
     
     def __getitem__(self, selector):
@@ -38,22 +43,139 @@ class RecordSetColumn(object):
             if selector.step:
                 raise NotImplementedError("Columns should not be sliced by steps. Window the RecordSet and group records instead.")
             
-            return ((record._tuple[self._index]
-                      for record
-                      in group )
+            return (self._iterColumn(group)
                     for group 
                     in islice(self._source._groups, selector.start, selector.stop) )
         else:
-            return (record._tuple[self._index]
-                      for record
-                      in self._source._groups[selector] )
+            return self._iterColumn(self._source._groups[selector])
 
     def __repr__(self):
         'Format the representation string for better printing'
         return 'RecordSetColumn("%s" at %d)' % (self._source._RecordType._fields[self._index], self._index)
 
+
+
+class Retention(object):
+    """Limits how much a RecordSet holds on to. Limits left as None are not enforced.
+       Only whole groups are dropped, oldest first, and never before
+         every scanner on the RecordSet has moved past them.
+    
+    maxGroups:  how many groups to keep
+    maxRecords: how many records to keep (whole groups go, so it may keep fewer)
+    maxAge:     how far behind the newest keyField value a group's last record may be
+    """
+    __slots__ = ('maxGroups', 'maxRecords', 'maxAge', 'keyField')
+    
+    def __init__(self, maxGroups=None, maxRecords=None, maxAge=None, keyField=None):
+        assert maxAge is None or keyField is not None, 'A keyField is needed to tell the age of a group.'
+        self.maxGroups = maxGroups
+        self.maxRecords = maxRecords
+        self.maxAge = maxAge
+        self.keyField = keyField
+        
+    def excessGroups(self, recordSet):
+        """Returns how many of the leading groups fall outside the limits."""
+        groups = recordSet._groups
+        excess = 0
+        
+        if self.maxGroups is not None:
+            excess = max(excess, len(groups) - self.maxGroups)
+        
+        if self.maxRecords is not None:
+            # the first group that starts late enough for the rest to fit
+            cutoff = recordSet.record_count - self.maxRecords
+            excess = max(excess, bisect_left(recordSet._offsets, cutoff, 0, len(groups)))
+            
+        if self.maxAge is not None:
+            keyIx = recordSet._RecordType._lookup[self.keyField]
+            for group in reversed(groups):
+                if group:
+                    cutoff = group[-1]._tuple[keyIx] - self.maxAge
+                    break
+            else:
+                return excess
+            gix = 0
+            while not groups[gix] or groups[gix][-1]._tuple[keyIx] < cutoff:
+                gix += 1
+            excess = max(excess, gix)
+            
+        return excess
+
+    def __repr__(self):
+        return 'Retention(%s)' % ', '.join('%s=%r' % (limit, getattr(self, limit)) 
+                                          for limit in self.__slots__ 
+                                          if getattr(self, limit) is not None)
+
         
 
+class RecordSetIndex(object):
+    """Maps the values of some fields to where the records holding them are,
+         so membership, counts and lookups don't need to scan the RecordSet.
+       Positions are kept as (group, record) indexes, counting groups from 
+         the first ever added, so truncation only needs to forget what was dropped.
+    """
+    __slots__ = ('fields', '_fieldIxs', '_entries', '_base')
+
+    def __init__(self, RecordType, fields):
+        self.fields = tuple(fields)
+        self._fieldIxs = tuple(RecordType._lookup[field] for field in self.fields)
+        self.reset()
+
+    def reset(self):
+        self._entries = {}
+        self._base = 0
+
+    def key(self, values):
+        """The index key for the values of a record."""
+        return tuple([values[ix] for ix in self._fieldIxs])
+
+    def add(self, gix, group, start=0):
+        """Index the records of the group at gix, from the start position on."""
+        entries = self._entries
+        gix += self._base
+        fieldIxs = self._fieldIxs
+        for rix, values in enumerate(islice(groupRows(group), start, None), start):
+            key = tuple([values[ix] for ix in fieldIxs])
+            if key in entries:
+                entries[key].append((gix, rix))
+            else:
+                entries[key] = [(gix, rix)]
+
+    def drop(self, groups):
+        """Forget the groups being truncated from the start of the RecordSet."""
+        base = self._base + len(groups)
+        cutoff = (base,)
+        entries = self._entries
+        for group in groups:
+            for values in groupRows(group):
+                key = self.key(values)
+                positions = entries.get(key)
+                if positions is None: # already cleared for an earlier duplicate
+                    continue
+                del positions[:bisect_left(positions, cutoff)]
+                if not positions:
+                    del entries[key]
+        self._base = base
+
+    def positions(self, key):
+        """Returns the (group, record) indexes of the records with the key, in order."""
+        base = self._base
+        return [(gix - base, rix) for gix, rix in self._entries.get(key, ())]
+
+    def count(self, key):
+        return len(self._entries.get(key, ()))
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return 'RecordSetIndex(%s: %d keys)' % (', '.join(self.fields), len(self._entries))
+
+
+
 class RecordSet(UpdateModel):
     """Holds groups of records. The gindex is the label for each of the tuples of Records.
     
@@ -63,7 +185,10 @@ class RecordSet(UpdateModel):
     # References need to be weak to ensure garbage collection can continue like normal.
     _instances = WeakSet()
 
-    __slots__ = ('_RecordType', '_groups', '_columns')
+    __slots__ = ('_RecordType', '_GroupType', '_groups', '_columns',
+                 '_offsets', '_indexes', '_scanners', '_retention',
+                 '_sortKey', '_lastKeys', '_removedGroups', '_removedRecords',
+                 '_lock')
 
 
     def __new__(cls, *args, **kwargs):
@@ -78,23 +203,62 @@ class RecordSet(UpdateModel):
         for instance in instances:
             instance.truncate()
 
-    def truncate(self):
+    def truncate(self, groupCount=None):
         """Clear out data that is not unused.
            Cooperate with the scanners pointing to this RecordSet
-             by asking for a tuple declaring what records or groups
-             it needs.
+             by asking each for the first group it still needs.
            Only groups are truncated, and only from the beginning.
+           Unless a groupCount is given, the retention policy decides
+             how many groups should go (and without one, none do).
            Once completed, each listening scanner is notified
              so its cursors can be corrected accordingly.
+           Returns the number of groups removed.
         """
-        raise NotImplementedError
+        with self._lock:
+            if groupCount is None:
+                if self._retention is None:
+                    return 0
+                groupCount = self._retention.excessGroups(self)
+
+            groupCount = min(groupCount, len(self._groups))
+            listeningScanners = list(self._scanners)
+            for scanner in listeningScanners:
+                groupCount = min(groupCount, scanner.firstNeededGroup)
+        
+            if groupCount <= 0:
+                return 0
+        
+            if self._indexes:
+                dropped = self._groups[:groupCount]
+                for index in self._indexes.values():
+                    index.drop(dropped)
+
+            # in place, since anything holding the list should see the same groups
+            del self._groups[:groupCount]
+            if self._sortKey is not None:
+                del self._lastKeys[:groupCount]
+            removed = self._offsets[groupCount]
+            self._offsets = [offset - removed for offset in self._offsets[groupCount:]]
+            self._removedGroups += groupCount
+            self._removedRecords += removed
+
+            for scanner in listeningScanners:
+                scanner.updateCursorsForRemoval(groupCount)
+        
+            return groupCount
 
-        safeGroupIx = -1
-        for scanner in listeningScanners:
-            pass
+    def _attachScanner(self, scanner):
+        """Scanners (and views) register so they can be asked before groups are truncated."""
+        self._scanners.add(scanner)
 
-        for scanner in listeningScanners:
-            scanner.updateCursorsForRemoval(safeGroupIx)
+    @property
+    def retention(self):
+        return self._retention
+
+    @retention.setter
+    def retention(self, policy):
+        self._retention = policy
+        self.truncate()
 
 
     # INIT
@@ -103,11 +267,10 @@ class RecordSet(UpdateModel):
         """
         self._RecordType = genRecordType(dataset.getColumnNames())
         columnIxs = range(len(self._RecordType._fields))
-        records = []
+        rows = []
         for rix in range(dataset.getRowCount()):
-            row = tuple(dataset.getValueAt(rix, cix) for cix in columnIxs)
-            records.append(self._RecordType(row))
-        self._groups = [tuple(records)]
+            rows.append(tuple(dataset.getValueAt(rix, cix) for cix in columnIxs))
+        self._groups = [self._buildGroup(rows)]
         
     def _initializeEmpty(self, RecordType):
         """Simply define what kind of RecordSet this will be, but start with no data.
@@ -120,9 +283,7 @@ class RecordSet(UpdateModel):
            Using a generator as the tuple argument is about 4-10x slower.
         """
         self._RecordType = RecordType
-        self._groups = [tuple([RecordType(record) 
-                               for record 
-                               in data])]
+        self._groups = [self._buildGroup(data)]
     
     def _initializeRecords(self, records, validate=False):
         """Initialize RecordSet from the records provided.
@@ -132,18 +293,42 @@ class RecordSet(UpdateModel):
         self._RecordType = type(records[0])
         if validate:
             assert all(isinstance(r, RecordType) for r in records), 'All entries were not the same RecordType'
-        self._groups = [tuple(records)]
+        if self._GroupType is None:
+            self._groups = [tuple(records)]
+        else:
+            self._groups = [self._buildGroup(records)]
 
     def _initializeCopy(self, recordSet):
         self._RecordType = recordSet._RecordType
-        self._groups = [group for group in recordSet._groups]
+        if self._GroupType is recordSet._GroupType:
+            self._groups = [group for group in recordSet._groups]
+        else:
+            self._groups = [self._buildGroup(group) for group in recordSet._groups]
         # Note that it'll regenerate indexes even on copy...
         
     
-    def __init__(self, initialData=None,  recordType=None, initialLabel=None, validate=False, scalar_tuples=False, *args, **kwargs):#, indexingFunction=None):        
+    def __init__(self, initialData=None,  recordType=None, initialLabel=None, validate=False, scalar_tuples=False, groupType=None, retention=None, sortKey=None, *args, **kwargs):#, indexingFunction=None):        
         """When creating a new RecordSet, the key is to provide an unambiguous RecordType,
              or at least enough information to define one.
+           The groupType sets how groups are stored (see ligature.storage).
+             By default they are tuples of records, and copies keep the storage of the original.
+             RowGroup keeps just the tuples of values, so ingesting doesn't build a record per row.
+           A Retention policy bounds how much is kept as groups get added.
+           If a sortKey field is given, records must stay in order by it,
+             and ranges of it can be found by bisection (see range).
         """        
+        if groupType is None and isinstance(initialData, RecordSet):
+            groupType = initialData._GroupType
+        self._GroupType = groupType
+        self._sortKey = sortKey
+        self._retention = retention
+        self._scanners = WeakSet()
+        self._indexes = {}
+        self._removedGroups = 0
+        self._removedRecords = 0
+        # changes to the groups (and the cursors on them) happen under the lock
+        self._lock = threading.RLock()
+
         # We can initialize with a record type, a record, or an iterable of records
         # First check if it's a DataSet object. If so, convert it.
         if isinstance(initialData, BasicDataset):
@@ -164,6 +349,12 @@ class RecordSet(UpdateModel):
         else:
             raise ValueError("""Insufficient information to initialize the RecordSet."""
                              """ A RecordType must be implied by the constructor arguments.""")
+        
+        self._recountOffsets()
+        if self._sortKey is not None:
+            self._lastKeys = []
+            for group in self._groups:
+                self._lastKeys.append(self._checkSorted(group))
                 
         # monkey patch for higher speed access
         self._columns = tuple(RecordSetColumn(self, ix) 
@@ -175,10 +366,54 @@ class RecordSet(UpdateModel):
             
             
     def clear(self):
-        self._groups = []
+        with self._lock:
+            self._removedGroups += len(self._groups)
+            self._removedRecords += self._offsets[-1]
+            self._groups = []
+            self._offsets = [0]
+            if self._sortKey is not None:
+                self._lastKeys = []
+            for index in self._indexes.values():
+                index.reset()
         self.notify(slice(None, None), slice(None, None),)
         
         
+    def checkpoint(self):
+        """The contents as plain tuples of values, ready to be pickled (see restore)."""
+        with self._lock:
+            return {
+                'fields': self._RecordType._fields,
+                'groups': [tuple(groupRows(group)) for group in self._groups],
+                'removedGroups': self._removedGroups,
+                'removedRecords': self._removedRecords,
+            }
+
+    def restore(self, state):
+        """Replace the contents with those of a checkpoint.
+           Listeners are not notified, since restoring is meant for a whole 
+             graph at once (see ligature.checkpoint).
+        """
+        if tuple(state['fields']) != self._RecordType._fields:
+            raise ValueError('Checkpoint is for fields %r, not %r' % (tuple(state['fields']), self._RecordType._fields))
+        with self._lock:
+            RecordType = self._RecordType
+            if self._GroupType is None:
+                make = RecordType._make
+                self._groups = [tuple([make(values) for values in rows]) for rows in state['groups']]
+            else:
+                self._groups = [self._GroupType.fromRows(RecordType, list(rows)) for rows in state['groups']]
+            self._removedGroups = state['removedGroups']
+            self._removedRecords = state['removedRecords']
+            self._recountOffsets()
+            if self._sortKey is not None:
+                self._lastKeys = []
+                for group in self._groups:
+                    self._lastKeys.append(self._checkSorted(group))
+            for index in self._indexes.values():
+                index.reset()
+                for gix, group in enumerate(self._groups):
+                    index.add(gix, group)
+
     def column(self,column):
         return self._columns[self._RecordType._lookup[column]]
 
@@ -186,12 +421,206 @@ class RecordSet(UpdateModel):
     def coerceRecordType(self, record):
         return self._RecordType(record)
 
+    def _buildGroup(self, entries):
+        """Make a new group of records out of the entries, in the RecordSet's storage."""
+        RecordType = self._RecordType
+        if self._GroupType is None:
+            # tuple creation is slightly faster if the generator is consumed by a list first
+            return tuple([RecordType(entry)
+                          for entry
+                          in entries])
+        else:
+            coerce = RecordType._coerceTuple
+            return self._GroupType.fromRows(RecordType, [coerce(entry) 
+                                                         for entry 
+                                                         in entries])
+
+    def _redefine(self, RecordType):
+        """Change what kind of records an empty RecordSet holds.
+           This lets a Composable narrow its results before any data arrives.
+        """
+        assert not self._groups, 'Only an empty RecordSet can change its RecordType.'
+        self._RecordType = RecordType
+        self._columns = tuple(RecordSetColumn(self, ix) 
+                              for ix 
+                              in range(len(RecordType._fields)))
+        indexes = {}
+        for fields in self._indexes:
+            if all(field in RecordType._lookup for field in fields):
+                indexes[fields] = RecordSetIndex(RecordType, fields)
+        self._indexes = indexes
+        if self._sortKey is not None and not self._sortKey in RecordType._lookup:
+            self._sortKey = None
+
+    def _recountOffsets(self):
+        """Offsets are where each group starts in the records, 
+             with the total record count at the end.
+           These are kept up to date as groups are added or removed,
+             so records can be found without walking the groups.
+        """
+        offsets = [0]
+        for group in self._groups:
+            offsets.append(offsets[-1] + len(group))
+        self._offsets = offsets
+
+    def _locate(self, index):
+        """Returns the group index and the position in that group for a (positive) record index."""
+        # empty groups share their start with the next, so take the last that starts at or before
+        gix = bisect_right(self._offsets, index, 0, len(self._groups)) - 1
+        return gix, index - self._offsets[gix]
+
+    def _iterSlice(self, start, stop, step):
+        """Yields the records in range(start, stop, step), starting directly at the first."""
+        remaining = len(xrange(start, stop, step))
+        if not remaining:
+            return
+        groups = self._groups
+        gix, rix = self._locate(start)
+        if step > 0:
+            while remaining:
+                group = groups[gix]
+                while rix < len(group) and remaining:
+                    yield group[rix]
+                    rix += step
+                    remaining -= 1
+                rix -= len(group)
+                gix += 1
+        else:
+            while remaining:
+                group = groups[gix]
+                while rix >= 0 and remaining:
+                    yield group[rix]
+                    rix += step
+                    remaining -= 1
+                gix -= 1
+                rix += len(groups[gix])
+
+    def _extendLastGroup(self, records):
+        """Add records onto the end of the last group, instead of making a new one.
+           This is for transforms that may need to continue the group they made last time.
+        """
+        with self._lock:
+            start = len(self._groups[-1])
+            addition = self._buildGroup(records)
+            if self._sortKey is not None:
+                self._lastKeys[-1] = self._checkSorted(addition)
+            self._groups[-1] += addition
+            self._offsets[-1] = self._offsets[-2] + len(self._groups[-1])
+            for index in self._indexes.values():
+                index.add(len(self._groups) - 1, self._groups[-1], start)
+
+    def _indexGroups(self, start):
+        """Add the groups from start on to the indexes."""
+        for index in self._indexes.values():
+            for gix in range(start, len(self._groups)):
+                index.add(gix, self._groups[gix])
+
+    @property
+    def sortKey(self):
+        return self._sortKey
+
+    def _checkSorted(self, group):
+        """Ensure the group keeps the records ordered by the sort key, following the last group.
+           Returns the last key in the group, or the previous if it is empty.
+        """
+        keyIx = self._RecordType._lookup[self._sortKey]
+        previous = self._lastKeys[-1] if self._lastKeys else None
+        for values in groupRows(group):
+            key = values[keyIx]
+            if previous is not None and key < previous:
+                raise ValueError('Records must be in order by "%s", but %r came after %r' % (self._sortKey, key, previous))
+            previous = key
+        return previous
+
+    def _bisectKey(self, value, right=False):
+        """Returns the index of the first record whose sort key is at least 
+             the value (or more than the value, if right).
+           The groups are bisected by their last keys first, then the records in the one found.
+        """
+        if right:
+            gix = bisect_right(self._lastKeys, value)
+        else:
+            gix = bisect_left(self._lastKeys, value)
+        if gix == len(self._groups):
+            return self._offsets[-1]
+        
+        group = self._groups[gix]
+        keyIx = self._RecordType._lookup[self._sortKey]
+        if isinstance(group, Group):
+            column = group.column(keyIx)
+            getKey = lambda rix: column[rix]
+        else:
+            getKey = lambda rix: group[rix]._tuple[keyIx]
+        
+        lo, hi = 0, len(group)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if getKey(mid) < value or (right and getKey(mid) == value):
+                lo = mid + 1
+            else:
+                hi = mid
+        return self._offsets[gix] + lo
+
+    def range(self, field, lo=None, hi=None):
+        """Returns a view of the records where lo <= field < hi. Either bound may be left as None.
+           The RecordSet must be sorted by the field.
+        """
+        from ligature.view import RecordSetView
+
+        if field != self._sortKey:
+            raise ValueError('Ranges need the RecordSet sorted by "%s", but it is sorted by %r' % (field, self._sortKey))
+        start = 0 if lo is None else self._bisectKey(lo)
+        stop = self._offsets[-1] if hi is None else self._bisectKey(hi)
+        return RecordSetView(self, start, max(start, stop))
+
+    def addIndex(self, *fields):
+        """Keep an index on the given fields (or all of them, if none are given).
+           It is kept up to date as groups are added, so lookups on those fields
+             don't need to scan. Indexing all fields speeds up finding records.
+        """
+        fields = fields or self._RecordType._fields
+        if not fields in self._indexes:
+            index = RecordSetIndex(self._RecordType, fields)
+            for gix, group in enumerate(self._groups):
+                index.add(gix, group)
+            self._indexes[fields] = index
+        return self._indexes[fields]
+
+    def lookup(self, **criteria):
+        """Returns the records where the fields have the given values, in order.
+           If no index is kept on exactly those fields, the records are scanned.
+        """
+        for fields, index in self._indexes.items():
+            if len(fields) == len(criteria) and all(field in criteria for field in fields):
+                groups = self._groups
+                return [groups[gix][rix] 
+                        for gix, rix 
+                        in index.positions(tuple(criteria[field] for field in fields))]
+        criteria = [(self._RecordType._lookup[field], value) 
+                    for field, value
+                    in criteria.items()]
+        return [record
+                for group in self._groups
+                for record in group
+                if all(record._tuple[ix] == value for ix, value in criteria)]
+
     # Sized
     def __len__(self):
         """Not terribly useful - this only tells how many chunks there are in the RecordSet.
            Use this as a poor man's fast cardinality check against other RecordSets.
+           For the number of records, see record_count.
         """
         return len(self._groups)
+
+    @property
+    def record_count(self):
+        """The total number of records, across all groups. This is kept as groups change, not counted."""
+        return self._offsets[-1]
+
+    @property
+    def offsets(self):
+        """The record index each group starts at."""
+        return tuple(self._offsets[:-1])
     
     # Iterable 
     # Sequence
@@ -204,29 +633,15 @@ class RecordSet(UpdateModel):
             column,slicer = selector
             return self.column(column)[slicer]
         elif isinstance(selector, slice):
-            if (selector.start or 0) < 0:
-                return islice(self.records_reversed, 
-                    selector.stop if selector.stop is None else -selector.stop, 
-                    - selector.start, selector.step)
-            else:
-                return islice(self.records, selector.start, selector.stop, selector.step)     
-        elif isinstance(selector, int):
+            return self._iterSlice(*selector.indices(self._offsets[-1]))
+        elif isinstance(selector, (int, long)):
             index = selector
-            if index >= 0:
-                for group in self._groups:
-                    if len(group) > index:
-                        return group[index]
-                    index -= len(group)
-                else:
-                    raise IndexError("There are not enough records in the groups to meet the index %d" % selector)
-            else:
-                index *= -1 # make absolute to count backwards from
-                for group in reversed(self._groups):
-                    if len(group) >= index:
-                        return group[len(group)-index]
-                    index -= len(group)
-                else:
-                    raise IndexError("There are not enough records in the groups to meet back to the index %d" % selector)
+            if index < 0:
+                index += self._offsets[-1]
+            if not 0 <= index < self._offsets[-1]:
+                raise IndexError("There are not enough records in the groups to meet the index %d" % selector)
+            gix, rix = self._locate(index)
+            return self._groups[gix][rix]
         else:
             raise NotImplementedError("The selector '%r' is not implemented" % selector)
             #return self._groups[selector]
@@ -257,11 +672,13 @@ class RecordSet(UpdateModel):
     def __contains__(self, search):
         """Search from the start for the search object.
            If a record is provided, then the groups will themselves be 
-             exhaustively searched.
+             exhaustively searched for its values, unless all fields are indexed.
         """
         if isinstance(search, self._RecordType):
+            if self._RecordType._fields in self._indexes:
+                return search._tuple in self._indexes[self._RecordType._fields]
             for group in self._groups:
-                if search in group:
+                if search._tuple in groupRows(group):
                     return True
         elif search in self._groups:
             return True
@@ -276,14 +693,19 @@ class RecordSet(UpdateModel):
     def index(self, search, fromTop=True):
         """Returns the index of the group the search item is found in."""
         if fromTop:
-            iterDir = (gg for gg in reversed(enumerate(self._groups)))
+            iterDir = reversed(list(enumerate(self._groups)))
         else:
-            iterDir = (gg for gg in enumerate(self._groups))
+            iterDir = enumerate(self._groups)
             
         if isinstance(search, self._RecordType):
-            for gix, group in iterDir:
-                if record in group:
-                    return gix
+            if self._RecordType._fields in self._indexes:
+                positions = self._indexes[self._RecordType._fields].positions(search._tuple)
+                if positions:
+                    return positions[-1 if fromTop else 0][0]
+            else:
+                for gix, group in iterDir:
+                    if search._tuple in groupRows(group):
+                        return gix
         elif isinstance(search, tuple):
             for gix, group in iterDir:
                 if search == group:
@@ -298,10 +720,12 @@ class RecordSet(UpdateModel):
            Note that this tests for equivalency, not instantiation!
         """
         if isinstance(search, self._RecordType):
+            if self._RecordType._fields in self._indexes:
+                return self._indexes[self._RecordType._fields].count(search._tuple)
             return sum(1
                        for group in self._groups
-                       for record in group
-                       if record == search )
+                       for values in groupRows(group)
+                       if values == search._tuple )
         elif isinstance(search, tuple):
             return sum(1 for group in self._groups if search == group)
         return 0
@@ -313,14 +737,19 @@ class RecordSet(UpdateModel):
         if isinstance(addition, RecordSet):
             self.extend(addition)
         else:
-            if isinstance(addition, self._RecordType):
-                newGroup = (self.coerceRecordType(addition),)
-            else: 
-                # tuple creation is slightly faster if the generator is consumed by a list first
-                newGroup = tuple([self.coerceRecordType(entry)
-                                  for entry
-                                  in addition ])
-            self._groups.append(newGroup)
+            with self._lock:
+                if isinstance(addition, self._RecordType):
+                    newGroup = self._buildGroup((addition,))
+                else: 
+                    newGroup = self._buildGroup(addition)
+                if self._sortKey is not None:
+                    self._lastKeys.append(self._checkSorted(newGroup))
+                self._groups.append(newGroup)
+                self._offsets.append(self._offsets[-1] + len(newGroup))
+                if self._indexes:
+                    self._indexGroups(len(self._groups) - 1)
+                if self._retention is not None:
+                    self.truncate()
             # signal that a new group was added
             self.notify(None, slice(-1, None))
     
@@ -329,11 +758,35 @@ class RecordSet(UpdateModel):
         """
         if isinstance(additionalGroups, RecordSet):
             assert self._RecordType._fields == additionalGroups._RecordType._fields, 'RecordSets can only be extended by other RecordSets of the same RecordType.'
-            self._groups.extend(additionalGroups._groups)
+            # nothing added, so nothing to notify (slice(0, None) would read as everything)
+            if not additionalGroups._groups:
+                return
+            with self._lock:
+                if self._GroupType is additionalGroups._GroupType:
+                    newGroups = additionalGroups._groups
+                else:
+                    newGroups = [self._buildGroup(group) for group in additionalGroups._groups]
+                if self._sortKey is not None:
+                    lastKeys = len(self._lastKeys)
+                    try:
+                        for group in list(newGroups):
+                            self._lastKeys.append(self._checkSorted(group))
+                    except ValueError:
+                        del self._lastKeys[lastKeys:]
+                        raise
+                start = len(self._groups)
+                self._groups.extend(newGroups)
+                for group in self._groups[start:]:
+                    self._offsets.append(self._offsets[-1] + len(group))
+                if self._indexes:
+                    self._indexGroups(start)
+                if self._retention is not None:
+                    self.truncate()
             self.notify(None, slice(-len(additionalGroups),None))
         else:
-            for group in additionalGroups:
-                self.append(group)
+            with self.batch():
+                for group in additionalGroups:
+                    self.append(group)
     
     def __iadd__(self, addition):
         """Overload the shorthand += for convenience."""
@@ -357,7 +810,7 @@ class RecordSet(UpdateModel):
     def __repr__(self, elideLimit=20, tailCount=None, indent=''):
         'Format the representation string for better printing'
         records = list(islice((r for r in self.records), elideLimit))
-        totalRecordCount = sum(len(g) for g in self.groups)
+        totalRecordCount = self.record_count
         out = ['RecordSet: %d groups of %d records%s' % (
                     len(self), totalRecordCount, ' \n%s     meta: %r' % (indent, self.metadata,) if self.metadata else '')]
         # preprocess
@@ -1,3 +1,7 @@
+import threading
+from bisect import bisect_right
+
+
 def passthrough(*args):
     return args
 
@@ -18,9 +22,14 @@ class Scanner(object):
       zip()'d with it gets more data.
     """
     __metaclass__ = MetaScanner
-    __slots__ = ('source', 'getter', 
+    
+    # Set if the scanner never hands over more than its consumer used (so never needs a rewind)
+    Aligned = False
+    
+    __slots__ = ('source', 'getter', '_field_index', '_lock',
                  '_group_cursor', '_record_cursor',
                  '_iterating_group', '_iterating_record',
+                 '__weakref__',
                  )
     
     def __init__(self, source, field=None):
@@ -29,8 +38,18 @@ class Scanner(object):
         # allow Scanner to be a bit more generic while useful in the default
         if not field is None:
             self.getter = source._RecordType.getGetter(field)
+            self._field_index = source._RecordType._lookup[field]
         else: 
             self.getter = None
+            self._field_index = None
+        
+        # cursors move under the source's lock, so truncation can't shift them mid-step
+        self._lock = getattr(source, '_lock', None) or threading.RLock()
+        
+        # let the source know, so it can check with the scanner before truncating
+        attach = getattr(source, '_attachScanner', None)
+        if attach:
+            attach(self)
             
         self.reset() 
             
@@ -41,13 +60,19 @@ class Scanner(object):
         self._iterating_group = None
         self._iterating_record = None
 
-    def _iterGroup(self, group):
+    def _iterGroup(self, group, values=None):
+        """Yields the group's records from the cursor on, advancing the cursor past each.
+        Given values (one per record, starting from the cursor), those are yielded instead.
+        """
         try:
             self._iterating_group = group
-            for record in group[self._record_cursor:]:
+            if values is None:
+                # index from the cursor rather than slice, so resuming doesn't copy the group
+                values = (group[ix] for ix in xrange(self._record_cursor, len(group)))
+            for value in values:
                 # records in groups never get appended, so ensure it never gets over
                 self._record_cursor += 1
-                yield record
+                yield value
         finally:
             self._iterGroup_finally()
 
@@ -62,11 +87,40 @@ class Scanner(object):
         # Note that this is needed, since the finally clause in the iterGroup does NOT run
         #   but once PER ITERATION. That means if more than one scanner is zipped, only
         #   the first finally is run - the rest must know they stopped incompletely!
-        if self._record_cursor == len(self._iterating_group):
-            self._record_cursor= 0
-        else:
-            self._group_cursor -= 1
-        self._iterating_group = None
+        self._lock.acquire()
+        try:
+            # a seek since the iteration started has already settled the cursors
+            if self._iterating_group is None:
+                return
+            if self._record_cursor == len(self._iterating_group):
+                self._record_cursor= 0
+            else:
+                self._group_cursor -= 1
+            self._iterating_group = None
+        finally:
+            self._lock.release()
+
+    def _iterGroups(self):
+        """Yields the groups from the cursor on, advancing the cursor past each.
+        Groups are read by index, so nothing is copied, and groups
+          appended while iterating are picked up as well.
+        Each step happens under the source's lock.
+        """
+        # views and Composables build their group list on access, so it is
+        #   only fetched again once the one in hand runs out
+        groups = self.source._groups
+        while True:
+            self._lock.acquire()
+            try:
+                if self._group_cursor >= len(groups):
+                    groups = self.source._groups
+                    if self._group_cursor >= len(groups):
+                        return
+                group = groups[self._group_cursor]
+                self._group_cursor += 1
+            finally:
+                self._lock.release()
+            yield group
 
     def _iterRecord_finally(self):
         pass    
@@ -80,6 +134,84 @@ class Scanner(object):
     @property
     def exhausted(self):
         return self._record_cursor == 0 and self._group_cursor == len(self.source._groups)
+
+    @property
+    def firstNeededGroup(self):
+        """The index of the earliest group this scanner may still read.
+        The source is free to truncate any group before it.
+        """
+        # mid-iteration the group cursor is already past the group being read
+        if self._iterating_group is not None:
+            return self._group_cursor - 1
+        return self._group_cursor
+
+    @property
+    def position(self):
+        """The offset of the next record to scan, counting every record ever added to the source
+             (so it still holds after the source truncates).
+        """
+        self._lock.acquire()
+        try:
+            offsets = self.source._offsets
+            # mid-iteration the group cursor is already past the group being read
+            gix = self._group_cursor - 1 if self._iterating_group is not None else self._group_cursor
+            return (getattr(self.source, '_removedRecords', 0)
+                    + offsets[min(gix, len(offsets) - 1)] + self._record_cursor)
+        finally:
+            self._lock.release()
+
+    def seek(self, position):
+        """Move the cursors straight to the position (as given by the position property).
+        Positions past the end go to the end. Truncated records can't be returned to.
+        """
+        self._lock.acquire()
+        try:
+            offsets = self.source._offsets
+            removed = getattr(self.source, '_removedRecords', 0)
+            if position < removed:
+                raise ValueError('Records before %d have been truncated from the source' % removed)
+            position -= removed
+            groupCount = len(offsets) - 1
+            if position >= offsets[-1]:
+                self._group_cursor = groupCount
+                self._record_cursor = 0
+            else:
+                # the last group starting at or before the position (skipping any empty ones)
+                gix = bisect_right(offsets, position, 0, groupCount) - 1
+                self._group_cursor = gix
+                self._record_cursor = position - offsets[gix]
+            self._iterating_group = None
+        finally:
+            self._lock.release()
+
+    def checkpoint(self):
+        """The cursors, counting groups from the first ever added to the source (see restore)."""
+        self._lock.acquire()
+        try:
+            # mid-iteration the group cursor is already past the group being read
+            gix = self._group_cursor - 1 if self._iterating_group is not None else self._group_cursor
+            return {
+                'group': getattr(self.source, '_removedGroups', 0) + gix,
+                'record': self._record_cursor,
+            }
+        finally:
+            self._lock.release()
+
+    def restore(self, state):
+        """Put the cursors back where a checkpoint left them.
+           The source should be restored first, so the groups line up.
+        """
+        self._lock.acquire()
+        try:
+            self._group_cursor = max(0, state['group'] - getattr(self.source, '_removedGroups', 0))
+            self._record_cursor = state['record']
+            self._iterating_group = None
+        finally:
+            self._lock.release()
+
+    def updateCursorsForRemoval(self, groupCount):
+        """The source dropped its first groupCount groups, so shift to match."""
+        self._group_cursor = max(0, self._group_cursor - groupCount)
     
     def __repr__(self):
         return '%s on group %d and record %d' % (type(self), self._group_cursor, self._record_cursor)
@@ -89,6 +221,5 @@ class Scanner(object):
         
     def __iter__(self):
         raise NotImplementedError("The base scanner class' __iter__() must be overridden.")
-        # TODO: Make sure all iterators on `_groups` is thread safe
-        #   In a Jython environment, we don't want the iterator to change size while
-        #   in the __iter_* functions
+        # Iterators step through the groups with _iterGroups, so appends and 
+        #   truncation on other threads never leave the cursor pointing elsewhere
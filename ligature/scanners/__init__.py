@@ -2,3 +2,4 @@ from ligature.scanners.element import ElementScanner
 from ligature.scanners.chunk import ChunkScanner
 from ligature.scanners.record import RecordScanner
 from ligature.scanners.group import GroupScanner
+from ligature.scanners.batch import BatchScanner, MultiFieldScanner, alignedBatches
@@ -0,0 +1,133 @@
+from itertools import islice
+
+from ligature.scanners.element import ElementScanner
+from ligature.storage import ColumnarGroup, columnSlice, rowSlice
+
+
+DEFAULT_BATCH_SIZE = 1024
+
+
+class BatchScanner(ElementScanner):
+    """For a field in a source, this emits runs of up to batchSize values at once.
+       A run never crosses a group, and the cursors only move past what was
+       handed over, so batches never over-emit. Use alignedBatches to
+       take equal runs from several of them at once.
+    """
+    __slots__ = ('batchSize',)
+
+    Aligned = True
+
+    def __init__(self, source, field=None, batchSize=DEFAULT_BATCH_SIZE):
+        self.batchSize = batchSize
+        super(BatchScanner, self).__init__(source, field)
+
+    def _currentGroup(self):
+        # skip past finished (and empty) groups to the one with the next value
+        groups = self.source._groups
+        while self._group_cursor < len(groups):
+            group = groups[self._group_cursor]
+            if self._record_cursor < len(group):
+                return group
+            self._group_cursor += 1
+            self._record_cursor = 0
+        return None
+
+    def available(self, limit=None):
+        """How many values the next batch could have (up to the limit)."""
+        self._lock.acquire()
+        try:
+            group = self._currentGroup()
+            if group is None:
+                return 0
+            remaining = len(group) - self._record_cursor
+            return remaining if limit is None else min(limit, remaining)
+        finally:
+            self._lock.release()
+
+    def take(self, limit=None):
+        """Hands over the next run of values (up to the limit), advancing past them."""
+        self._lock.acquire()
+        try:
+            group = self._currentGroup()
+            if group is None:
+                return tuple()
+            start = self._record_cursor
+            stop = len(group) if limit is None else min(len(group), start + limit)
+            values = self._slice(group, start, stop)
+            if stop == len(group):
+                self._group_cursor += 1
+                self._record_cursor = 0
+            else:
+                self._record_cursor = stop
+            return values
+        finally:
+            self._lock.release()
+
+    def _slice(self, group, start, stop):
+        return columnSlice(group, self._field_index, start, stop)
+
+    def __iter__(self):
+        self._pending_finally()
+        while True:
+            values = self.take(self.batchSize)
+            if not values:
+                return
+            yield values
+
+
+class MultiFieldScanner(BatchScanner):
+    """Reads several fields of the source in lockstep, sharing one set of cursors.
+       Each batch is a tuple of runs, one per field, all the same length.
+    """
+    __slots__ = ('fields', '_field_indexes', '_getter')
+
+    def __init__(self, source, fields, batchSize=DEFAULT_BATCH_SIZE):
+        self.fields = tuple(fields)
+        self._field_indexes = tuple(source._RecordType._lookup[field] for field in self.fields)
+        self._getter = source._RecordType.getTupleGetter(*self.fields)
+        super(MultiFieldScanner, self).__init__(source, None, batchSize)
+
+    def _slice(self, group, start, stop):
+        # columnar groups already hold each field in its own buffer
+        if isinstance(group, ColumnarGroup):
+            return tuple(columnSlice(group, ix, start, stop) for ix in self._field_indexes)
+        # otherwise each row is read once, picking out all the fields in one call
+        picked = map(self._getter, rowSlice(group, start, stop))
+        if len(self.fields) == 1:
+            return (tuple(picked),)
+        if not picked:
+            return tuple(tuple() for field in self.fields)
+        return tuple(zip(*picked))
+
+
+def alignedBatches(scanners, batchSize=DEFAULT_BATCH_SIZE):
+    """Yields a tuple of equal length runs of values, one per scanner, until one runs dry.
+    Each run is as long as the shortest any of the BatchScanners has ready,
+      so they stay aligned without any rewinding. Other scanners (like Identity)
+      have that many values taken (or pulled) from them first, and if any 
+      comes up short, every run is clipped to match.
+    """
+    batched = [scanner for scanner in scanners if isinstance(scanner, BatchScanner)]
+    if not batched:
+        return
+    while True:
+        count = min(scanner.available(batchSize) for scanner in batched)
+        if not count:
+            return
+        
+        pulled = {}
+        for ix, scanner in enumerate(scanners):
+            if isinstance(scanner, BatchScanner):
+                continue
+            take = getattr(scanner, 'take', None)
+            if take is None:
+                run = tuple(islice(scanner, count))
+            else:
+                run = take(count)
+            pulled[ix] = run
+            count = min(count, len(run))
+        if not count:
+            return
+        
+        yield tuple(pulled[ix][:count] if ix in pulled else scanner.take(count)
+                    for ix, scanner in enumerate(scanners))
@@ -1,4 +1,5 @@
 from ligature.scanner import Scanner
+from ligature.storage import groupColumn
 
 
 class ChunkScanner(Scanner):
@@ -7,9 +8,8 @@ class ChunkScanner(Scanner):
     """
     def __iter__(self):
         self._pending_finally()
-        for group in self.source._groups[self._group_cursor:]: # error here merely stops iteration
-            self._group_cursor += 1
-            yield tuple(self.getter(record) for record in group)
+        for group in self._iterGroups(): # error here merely stops iteration
+            yield tuple(groupColumn(group, self._field_index))
             
     def rewind(self, steps=1):
         """Go back the given number of steps in the iteration."""
@@ -1,31 +1,38 @@
 from ligature.scanner import Scanner
+from ligature.storage import columnSlice
+
+
+# values are pulled out of a group in runs that start this long and double
+FIRST_RUN = 8
 
 
 class ElementScanner(Scanner):
     def __iter__(self):
         self._pending_finally()
-        for group in self.source._groups[self._group_cursor:]: # error here merely stops iteration
-            self._group_cursor += 1
-            for record in self._iterGroup(group):
-                yield self.getter(record)
+        for group in self._iterGroups(): # error here merely stops iteration
+            for value in self._iterGroup(group, self._iterValues(group)):
+                yield value
+
+    def _iterValues(self, group):
+        # Values are read from the cursor on in runs, rather than a getter call per record.
+        #   The runs start short, so resuming for just a few values copies only a few,
+        #   and double, so reading a whole group still takes just a handful of slices.
+        start = self._record_cursor
+        length = len(group)
+        run = FIRST_RUN
+        while start < length:
+            stop = min(length, start + run)
+            for value in columnSlice(group, self._field_index, start, stop):
+                yield value
+            start = stop
+            run *= 2
         
     def rewind(self, steps=1):
         """Go back the given number of steps in the iteration."""
-        while steps > 0:
-            steps -= 1
-            # If the record cursor is nonzero, back it off by one
-            if self._record_cursor > 0:
-                # remember, the group cursor aggressively iterates
-                if self._group_cursor >= len(self.source._groups):
-                    self._group_cursor = len(self.source._groups)-1 
-                else:
-                    self._record_cursor -= 1
-            # If the record cursor is at the start rewind the group
-            elif self._group_cursor:
-                if self._group_cursor >= len(self.source._groups):
-                    self._group_cursor = len(self.source._groups)-1 
-                else:
-                    self._group_cursor -= 1
-                self._record_cursor = len(self.source._groups[self._group_cursor]) -1
-            else: # already at the start
-                return
+        # jump straight there by the source's offsets, stopping at the start
+        self._lock.acquire()
+        try:
+            start = getattr(self.source, '_removedRecords', 0)
+            self.seek(max(start, self.position - steps))
+        finally:
+            self._lock.release()
@@ -20,6 +20,17 @@ class Identity(Scanner):
             
     def rewind(self, steps=1):
         self.reset()
+
+    def take(self, limit):
+        """The source does not run dry, so a run of any length is always there."""
+        return (self.getter(self),) * limit
+    
+    def checkpoint(self):
+        return {'group': self._group_cursor, 'record': 0}
+    
+    def restore(self, state):
+        self.reset()
+        self._group_cursor = state['group']
             
     def __iter__(self):
         for getted in self._iterGroup(None):
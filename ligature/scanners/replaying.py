@@ -19,14 +19,48 @@ class ReplayingScanner(Scanner):
         
     def anchor(self):
         """Moves the last acknowledged position to the current."""
-        # Cleanup after iteration means this function can see
-        #   two types of values: one while iterating and one statically.
-        if self._iterating_group and self._iterating_record:
-            self._group_anchor = self._group_cursor - 1
-        else:
-            self._group_anchor = self._group_cursor
-        
-        self._record_anchor = self._record_cursor
+        self._lock.acquire()
+        try:
+            # Cleanup after iteration means this function can see
+            #   two types of values: one while iterating and one statically.
+            if self._iterating_group and self._iterating_record:
+                self._group_anchor = self._group_cursor - 1
+            else:
+                self._group_anchor = self._group_cursor
+            
+            self._record_anchor = self._record_cursor
+        finally:
+            self._lock.release()
+
+    def _replay(self, records=True):
+        """Move the cursors back to the anchor (the record one too, if records are replayed)."""
+        self._lock.acquire()
+        try:
+            if records:
+                self._record_cursor = self._record_anchor
+            self._group_cursor = self._group_anchor
+        finally:
+            self._lock.release()
+
+    @property
+    def firstNeededGroup(self):
+        """Replays go back to the anchor, so that must be kept too."""
+        return min(self._group_anchor, super(ReplayingScanner, self).firstNeededGroup)
+
+    def updateCursorsForRemoval(self, groupCount):
+        super(ReplayingScanner, self).updateCursorsForRemoval(groupCount)
+        self._group_anchor = max(0, self._group_anchor - groupCount)
+
+    def checkpoint(self):
+        state = super(ReplayingScanner, self).checkpoint()
+        state['groupAnchor'] = getattr(self.source, '_removedGroups', 0) + self._group_anchor
+        state['recordAnchor'] = self._record_anchor
+        return state
+
+    def restore(self, state):
+        super(ReplayingScanner, self).restore(state)
+        self._group_anchor = max(0, state['groupAnchor'] - getattr(self.source, '_removedGroups', 0))
+        self._record_anchor = state['recordAnchor']
 
     @property
     def _anchored_group(self):
@@ -44,8 +78,7 @@ class ReplayingElementScanner(ReplayingScanner, ElementScanner):
        will simply resume from where the last ratchet was.
     """
     def __iter__(self):
-        self._record_cursor = self._record_anchor
-        self._group_cursor = self._group_anchor
+        self._replay()
             
         return super(ReplayingElementScanner,self).__iter__()
 
@@ -56,7 +89,7 @@ class ReplayingChunkScanner(ReplayingScanner, ChunkScanner):
        repeat from where the last ratchet was.
     """
     def __iter__(self):
-        self._group_cursor = self._group_anchor
+        self._replay(records=False)
         return super(ReplayingChunkScanner,self).__iter__()
 
 
@@ -66,8 +99,7 @@ class ReplayingRecordScanner(ReplayingScanner, RecordScanner):
        will simply resume from where the last ratchet was.
     """
     def __iter__(self):
-        self._record_cursor = self._record_anchor
-        self._group_cursor = self._group_anchor
+        self._replay()
             
         return super(ReplayingRecordScanner,self).__iter__()
 
@@ -78,5 +110,5 @@ class ReplayingGroupScanner(ReplayingScanner, GroupScanner):
        repeat from where the last ratchet was.
     """
     def __iter__(self):
-        self._group_cursor = self._group_anchor
+        self._replay(records=False)
         return super(ReplayingGroupScanner,self).__iter__()        
\ No newline at end of file
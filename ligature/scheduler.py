@@ -0,0 +1,150 @@
+"""
+    Apply a composition graph in order
+
+    Applying a Composable means bringing everything upstream of it up
+      to date first. Rather than recursing through the sources (which
+      visits a shared source once for every path to it), the scheduler
+      orders the graph so sources always come before what reads them,
+      and then applies each node that needs it exactly once.
+
+    Given an executor, nodes whose sources are all done run concurrently.
+"""
+
+import sys
+from Queue import Queue
+
+from ligature.compose import Composable
+
+
+__copyright__ = """Copyright (C) 2020 Corso Systems"""
+__license__ = 'Apache 2.0'
+__maintainer__ = 'Andrew Geiger'
+__email__ = 'andrew.geiger@corsosystems.com'
+
+__all__ = ['Scheduler', 'topologicalOrder']
+
+
+def topologicalOrder(composables):
+    """Returns the composables and every Composable upstream of them,
+         ordered so each comes after all of its sources.
+    """
+    ordered = []
+    visited = set()
+    # iterative depth first search, so deep chains don't hit the recursion limit
+    for composable in composables:
+        if composable in visited:
+            continue
+        visited.add(composable)
+        stack = [(composable, iter(composable.sources))]
+        while stack:
+            node, sources = stack[-1]
+            for source in sources:
+                if isinstance(source, Composable) and not source in visited:
+                    visited.add(source)
+                    stack.append((source, iter(source.sources)))
+                    break
+            else:
+                ordered.append(node)
+                _ = stack.pop()
+    return ordered
+
+
+class Scheduler(object):
+    """Brings the targets up to date, applying each node of the graph at most once.
+    The graph is gathered from the targets' sources each time, so it may change between runs.
+
+    An executor (anything with a submit method, like ligature._compat.ThreadPool
+      or a concurrent.futures.ThreadPoolExecutor) lets independent branches run 
+      at the same time. Process pools are not supported: nodes share live 
+      RecordSets and scanners, which can't be sent to another process.
+    """
+    __slots__ = ('targets', 'executor')
+
+    def __init__(self, *targets, **options):
+        self.targets = targets
+        self.executor = options.pop('executor', None)
+        if options:
+            raise TypeError('Unexpected options for the Scheduler: %r' % options.keys())
+        if type(self.executor).__name__ == 'ProcessPoolExecutor':
+            raise ValueError('Composables share live RecordSets and scanners, so they can only run in threads.')
+
+    @property
+    def order(self):
+        return topologicalOrder(self.targets)
+
+    def plan(self):
+        """Returns the nodes that will run, in order.
+        That is any that are waiting to be applied, along with anything
+          downstream of them, since new results will likely reach those too.
+        """
+        planned = []
+        for node in self.order:
+            if node._awaiting_apply or any(source in planned for source in node.sources):
+                planned.append(node)
+        return planned
+
+    def run(self):
+        """Apply the graph, returning the nodes that actually ran."""
+        if self.executor is not None:
+            return self._runConcurrently()
+        applied = []
+        for node in self.order:
+            if node._awaiting_apply:
+                node._apply()
+                applied.append(node)
+            node._debounce_scanners()
+        return applied
+
+    def _runConcurrently(self):
+        """Submit each node once all of its sources are done.
+        Whether a node needs applying is only checked once it is ready,
+          since its sources' new results are what mark it.
+        """
+        order = self.order
+        waitingOn = {}
+        dependents = dict((node, []) for node in order)
+        for node in order:
+            sources = set(source for source in node.sources if source in dependents)
+            waitingOn[node] = len(sources)
+            for source in sources:
+                dependents[source].append(node)
+
+        finished = Queue()
+        def runNode(node):
+            try:
+                ran = node._awaiting_apply
+                if ran:
+                    node._apply()
+                node._debounce_scanners()
+                finished.put((node, ran, None))
+            except:
+                finished.put((node, False, sys.exc_info()))
+
+        applied = []
+        error = None
+        running = 0
+        for node in order:
+            if not waitingOn[node]:
+                self.executor.submit(runNode, node)
+                running += 1
+
+        while running:
+            node, ran, exc_info = finished.get()
+            running -= 1
+            if exc_info is not None:
+                # let what's running finish, but start nothing new
+                error = error or exc_info
+                continue
+            if ran:
+                applied.append(node)
+            if error:
+                continue
+            for dependent in dependents[node]:
+                waitingOn[dependent] -= 1
+                if not waitingOn[dependent]:
+                    self.executor.submit(runNode, dependent)
+                    running += 1
+
+        if error:
+            raise error[0], error[1], error[2]
+        return applied
\ No newline at end of file
@@ -0,0 +1,280 @@
+"""
+    Alternative group storage for RecordSets
+
+    By default a RecordSet group is a tuple of RecordType instances.
+      The groups here hold the same values in other layouts and only
+      build RecordType instances when a caller asks for records.
+      Scanners can read the values directly instead.
+"""
+
+from itertools import izip as zip
+from itertools import islice, imap
+from array import array
+from operator import itemgetter, attrgetter
+
+
+__copyright__ = """Copyright (C) 2020 Corso Systems"""
+__license__ = 'Apache 2.0'
+__maintainer__ = 'Andrew Geiger'
+__email__ = 'andrew.geiger@corsosystems.com'
+
+__all__ = ['Group', 'RowGroup', 'ColumnarGroup', 'GroupView', 'groupColumn', 'columnSlice', 'groupRows', 'rowSlice']
+
+
+def packColumn(values):
+    """Pack a column of values into the tightest buffer that holds them exactly.
+    Homogeneous floats and ints go into an array, anything else into a tuple.
+    """
+    kinds = set(type(value) for value in values)
+    if kinds == set([float]):
+        return array('d', values)
+    elif kinds == set([int]):
+        return array('l', values)
+    else:
+        return tuple(values)
+
+
+# the backing tuple of a record, fetched without a Python frame per record
+recordValues = attrgetter('_tuple')
+
+
+def checkRowWidths(RecordType, rows):
+    """Every row must have a value for each field, just as a RecordType checks when made."""
+    expected = len(RecordType._fields)
+    for width in set(map(len, rows)):
+        assert width == expected, 'Expected %d args, but got %d' % (expected, width)
+
+
+def groupColumn(group, index):
+    """Returns the values of a column in the group.
+    Storage groups hand over their buffer, while tuples of records get unwrapped.
+    """
+    if isinstance(group, Group):
+        return group.column(index)
+    return tuple(map(itemgetter(index), map(recordValues, group)))
+
+
+def columnSlice(group, index, start, stop):
+    """Returns the column's values for just the records from start up to stop."""
+    if isinstance(group, Group):
+        return group.columnSlice(index, start, stop)
+    return tuple(map(itemgetter(index), map(recordValues, group[start:stop])))
+
+
+def groupRows(group):
+    """Iterates the values of each record in the group, as tuples."""
+    if isinstance(group, Group):
+        return group.rows()
+    return imap(recordValues, group)
+
+
+def rowSlice(group, start, stop):
+    """Returns the values of just the records from start up to stop, as tuples."""
+    if isinstance(group, Group):
+        return group.rowSlice(start, stop)
+    return map(recordValues, group[start:stop])
+
+
+class Group(object):
+    """Base for groups that are not simply tuples of records.
+    Acts like an immutable sequence of records, but subclasses
+      decide how the values are actually held.
+    """
+    __slots__ = ('_RecordType',)
+
+    @classmethod
+    def fromRows(cls, RecordType, rows):
+        """Build the group from a list of tuples, as held by RecordType._tuple"""
+        raise NotImplementedError("Group storage must define how it is built from rows.")
+
+    def column(self, index):
+        raise NotImplementedError("Group storage must define how a column is retrieved.")
+
+    def columnSlice(self, index, start, stop):
+        return self.column(index)[start:stop]
+
+    def row(self, index):
+        raise NotImplementedError("Group storage must define how a row is retrieved.")
+
+    def rows(self):
+        return (self.row(ix) for ix in range(len(self)))
+
+    def rowSlice(self, start, stop):
+        return [self.row(ix) for ix in xrange(start, min(stop, len(self)))]
+
+    def __len__(self):
+        raise NotImplementedError("Group storage must define its length.")
+
+    def __iter__(self):
+        make = self._RecordType._make
+        return (make(row) for row in self.rows())
+
+    def __reversed__(self):
+        make = self._RecordType._make
+        return (make(self.row(ix)) for ix in reversed(range(len(self))))
+
+    def __getitem__(self, selector):
+        """Records are only materialized here, when asked for."""
+        make = self._RecordType._make
+        if isinstance(selector, slice):
+            return tuple(make(self.row(ix))
+                         for ix
+                         in range(*selector.indices(len(self))))
+        if selector < 0:
+            selector += len(self)
+        if not 0 <= selector < len(self):
+            raise IndexError('Group index out of range')
+        return make(self.row(selector))
+
+    def __contains__(self, search):
+        values = getattr(search, '_tuple', search)
+        return any(row == values for row in self.rows())
+
+    def __eq__(self, other):
+        if isinstance(other, Group):
+            return len(self) == len(other) and all(a == b for a, b in zip(self.rows(), other.rows()))
+        try:
+            return len(self) == len(other) and all(row == getattr(record, '_tuple', record)
+                                                   for row, record
+                                                   in zip(self.rows(), other))
+        except TypeError:
+            return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __add__(self, other):
+        """Concatenation keeps the storage type of the group."""
+        coerce = self._RecordType._coerceTuple
+        return self.fromRows(self._RecordType, list(self.rows()) + [coerce(record) for record in other])
+
+    def __repr__(self):
+        return '<%s of %d %s>' % (type(self).__name__, len(self), self._RecordType.__name__)
+
+
+class RowGroup(Group):
+    """Holds a group as the raw tuples of values.
+    Ingesting skips building a RecordType per row, and scanners
+      read the values straight out of the tuples.
+    """
+    __slots__ = ('_rows',)
+
+    def __init__(self, RecordType, rows):
+        self._RecordType = RecordType
+        self._rows = tuple(rows)
+        checkRowWidths(RecordType, self._rows)
+
+    @classmethod
+    def fromRows(cls, RecordType, rows):
+        return cls(RecordType, rows)
+
+    def column(self, index):
+        return tuple(map(itemgetter(index), self._rows))
+
+    def columnSlice(self, index, start, stop):
+        return tuple(map(itemgetter(index), self._rows[start:stop]))
+
+    def row(self, index):
+        return self._rows[index]
+
+    def rows(self):
+        return iter(self._rows)
+
+    def rowSlice(self, start, stop):
+        return self._rows[start:stop]
+
+    def __len__(self):
+        return len(self._rows)
+
+
+class ColumnarGroup(Group):
+    """Holds a group as one buffer per column.
+    Floats and ints are packed into arrays, so millions of samples
+      do not need a tuple slot and a RecordType wrapper each.
+    """
+    __slots__ = ('_columns', '_length')
+
+    def __init__(self, RecordType, columns):
+        self._RecordType = RecordType
+        self._columns = tuple(columns)
+        self._length = len(self._columns[0]) if self._columns else 0
+
+    @classmethod
+    def fromRows(cls, RecordType, rows):
+        # zip would quietly cut every row down to the shortest
+        checkRowWidths(RecordType, rows)
+        if rows:
+            columns = [packColumn(column) for column in zip(*rows)]
+        else:
+            columns = [tuple() for field in RecordType._fields]
+        return cls(RecordType, columns)
+
+    def column(self, index):
+        return self._columns[index]
+
+    def row(self, index):
+        return tuple(column[index] for column in self._columns)
+
+    def rows(self):
+        return zip(*self._columns)
+
+    def __len__(self):
+        return self._length
+
+
+class GroupView(Group):
+    """A window onto some of the records of another group, 
+         optionally with only some of the fields.
+       Nothing is copied until values are asked for.
+    """
+    __slots__ = ('_group', '_start', '_stop', '_fieldIxs')
+
+    def __init__(self, RecordType, group, start=0, stop=None, fieldIxs=None):
+        self._RecordType = RecordType
+        self._group = group
+        self._start = start
+        self._stop = len(group) if stop is None else stop
+        self._fieldIxs = fieldIxs
+
+    def _project(self, values):
+        if self._fieldIxs is None:
+            return values
+        return tuple([values[ix] for ix in self._fieldIxs])
+
+    def column(self, index):
+        if self._fieldIxs is not None:
+            index = self._fieldIxs[index]
+        column = groupColumn(self._group, index)
+        if self._start == 0 and self._stop == len(column):
+            return column
+        return column[self._start:self._stop]
+
+    def columnSlice(self, index, start, stop):
+        # only the rows asked for are read from the underlying group
+        if self._fieldIxs is not None:
+            index = self._fieldIxs[index]
+        length = len(self)
+        return columnSlice(self._group, index, 
+                           self._start + min(start, length), self._start + min(stop, length))
+
+    def rowSlice(self, start, stop):
+        length = len(self)
+        project = self._project
+        return [project(values) 
+                for values 
+                in rowSlice(self._group, self._start + min(start, length), self._start + min(stop, length))]
+
+    def row(self, index):
+        group = self._group
+        if isinstance(group, Group):
+            return self._project(group.row(self._start + index))
+        return self._project(group[self._start + index]._tuple)
+
+    def rows(self):
+        project = self._project
+        return (project(values) 
+                for values 
+                in islice(groupRows(self._group), self._start, self._stop))
+
+    def __len__(self):
+        return self._stop - self._start
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""
+    Stream groups from many slow sources into a RecordSet
+
+    Rather than a thread per feed, one pump thread polls every source
+      in turn and queues whatever groups are ready. The queue is bounded,
+      so if the graph falls behind, the pump waits (and the sources are
+      left holding their data) until the consumer catches up.
+
+    Sources only need a poll method: it returns the next group of records,
+      None when nothing is ready yet, and raises StopIteration once done.
+      Iterables work too - their items are polled the same way, so a
+      generator yields None while it waits on its feed.
+"""
+
+import sys, time, threading
+from Queue import Queue, Empty, Full
+
+
+__copyright__ = """Copyright (C) 2020 Corso Systems"""
+__license__ = 'Apache 2.0'
+__maintainer__ = 'Andrew Geiger'
+__email__ = 'andrew.geiger@corsosystems.com'
+
+__all__ = ['Ingestor', 'resultGroups']
+
+
+# queued by the pump when the last source finishes
+_FINISHED = object()
+
+
+class Ingestor(object):
+    """Polls the sources on one thread, queueing up to maxPending groups for the RecordSet.
+    The groups reach the RecordSet when drained, in one batch of notifications,
+      so the graph is only marked for update once per drain.
+    Errors from a source drop it, and are raised from the next drain.
+    """
+    __slots__ = ('recordset', 'interval', '_sources', '_pending',
+                 '_thread', '_running', '_errors')
+
+    def __init__(self, recordset, sources=tuple(), maxPending=16, interval=0.05):
+        self.recordset = recordset
+        self.interval = interval
+        self._sources = []
+        self._pending = Queue(maxPending)
+        self._thread = None
+        self._running = False
+        self._errors = []
+        for source in sources:
+            self.add(source)
+
+    def add(self, source):
+        """Adds a source to poll. Either something with a poll method, or an iterable."""
+        poll = getattr(source, 'poll', None)
+        if poll is None:
+            poll = iter(source).next
+        self._sources.append(poll)
+
+    @property
+    def sources(self):
+        return len(self._sources)
+
+    @property
+    def finished(self):
+        """True once nothing more will arrive: the pump is not running and the queue is drained."""
+        return not self._running and self._pending.empty()
+
+    def pumpOnce(self):
+        """Poll each source once, queueing what is ready. Returns the number of groups queued."""
+        queued = 0
+        for poll in self._sources[:]:
+            try:
+                group = poll()
+            except StopIteration:
+                self._sources.remove(poll)
+                continue
+            except:
+                self._errors.append(sys.exc_info())
+                self._sources.remove(poll)
+                continue
+            if group is None:
+                continue
+            if not self._queue(group):
+                break
+            queued += 1
+        return queued
+
+    def _queue(self, group):
+        # backpressure: wait for room, but don't outlast a stop
+        while True:
+            try:
+                self._pending.put(group, True, self.interval)
+                return True
+            except Full:
+                if not self._running:
+                    return False
+
+    def _pump(self):
+        try:
+            while self._running and self._sources:
+                if not self.pumpOnce():
+                    time.sleep(self.interval)
+        finally:
+            self._running = False
+            # wakes a blocked drain - if the queue is full, the drain won't be blocked anyway
+            try:
+                self._pending.put_nowait(_FINISHED)
+            except Full:
+                pass
+
+    def start(self):
+        """Poll the sources on a background thread until they finish (or stop is called)."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._pump)
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def stop(self, wait=True):
+        """Stop polling. A group still waiting for room in the queue is left behind."""
+        self._running = False
+        if wait and self._thread is not None:
+            # the pump may be waiting on the queue to drain
+            while self._thread.isAlive():
+                self._thread.join(self.interval)
+        self._thread = None
+
+    def drain(self, block=False, timeout=None):
+        """Append the queued groups to the RecordSet. Returns the number of groups appended.
+        If blocking, waits (up to the timeout) for at least one group,
+          unless the ingestor is finished.
+        """
+        groups = []
+        try:
+            if block and not self.finished:
+                groups.append(self._pending.get(True, timeout))
+            while True:
+                groups.append(self._pending.get_nowait())
+        except Empty:
+            pass
+
+        groups = [group for group in groups if group is not _FINISHED]
+        if groups:
+            self.recordset.extend(groups)
+
+        if self._errors:
+            exc_info = self._errors.pop(0)
+            raise exc_info[0], exc_info[1], exc_info[2]
+        return len(groups)
+
+    def __repr__(self):
+        return '<Ingestor %d sources, %d pending%s>' % (
+                    len(self._sources), self._pending.qsize(),
+                    ' (running)' if self._running else '')
+
+
+def resultGroups(composable, ingestor=None, timeout=None, executor=None):
+    """Yields the composable's result groups as they are made.
+    Groups already in the results come first. With an Ingestor feeding the
+      graph, each drain is followed by an apply and the new groups, until
+      the ingestor finishes (or nothing arrives before the timeout).
+    """
+    results = composable._resultset
+    seen = results._removedGroups
+    while True:
+        composable.apply(executor)
+
+        results._lock.acquire()
+        try:
+            removed = results._removedGroups
+            groups = results._groups[max(0, seen - removed):]
+            seen = removed + len(results._groups)
+        finally:
+            results._lock.release()
+
+        for group in groups:
+            yield group
+
+        if ingestor is None:
+            return
+        # nothing drained means the ingestor finished or the timeout passed
+        if not ingestor.drain(block=True, timeout=timeout):
+            return
\ No newline at end of file
@@ -4,7 +4,8 @@ import unittest
 from ligature.recordset import RecordSet
 from ligature.examples import simpleRecordSet, simpleAddition
 
-from ligature.calculations.aggregate import Aggregate
+from ligature.calculations.aggregate import Aggregate, IncrementalAggregate
+from ligature.combiner import Sum, Count, Min, Max, Mean, Variance
 
 
 class AggregateTestCase(unittest.TestCase):
@@ -44,7 +45,42 @@ class AggregateTestCase(unittest.TestCase):
 			[(119,)]
 			)
 
-		
+
+
+class IncrementalAggregateTestCase(unittest.TestCase):
+
+	def test_basic(self):
+
+		srs = RecordSet(simpleRecordSet)
+
+		c = IncrementalAggregate([srs], 
+			[Sum('a'), Count('a'), Min('a'), Max('a'), Mean('b'), Variance('a')], 
+			['total', 'n', 'low', 'high', 'average', 'variance'])
+
+		self.assertEqual(
+			[v._tuple for v in c.results],
+			[(45, 9, 1, 9, 4/9.0, 7.5)]
+			)
+
+		srs.extend(simpleAddition)
+
+		# only the new groups get folded in, but the result covers everything
+		self.assertEqual(
+			[v._tuple[:5] for v in c.results],
+			[(126, 15, 1, 16, 7/15.0)]
+			)
+		values = [1,2,3,4,5,6,7,8,9,11,12,13,14,15,16]
+		mean = sum(values) / 15.0
+		self.assertAlmostEqual(c.results[0].variance, sum((v - mean)**2 for v in values) / 14.0)
+
+		# states merge to the same as folding it all at once
+		variance = Variance('a')
+		self.assertEqual(
+			[round(v, 9) for v in variance.merge(variance.fold(variance.initial(), values[:4]), 
+			                                     variance.fold(variance.initial(), values[4:]))],
+			[round(v, 9) for v in variance.fold(variance.initial(), values)]
+			)
+
 
 def runTests():
 	suite = unittest.TestLoader().loadTestsFromTestCase(AggregateTestCase)
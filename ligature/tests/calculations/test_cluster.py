@@ -5,6 +5,7 @@ from ligature.recordset import RecordSet
 from ligature.examples import simpleRecordSet, simpleAddition
 
 from ligature.calculations.cluster import Cluster
+from ligature.vectorize import numpy
 
 
 class ClusterTestCase(unittest.TestCase):
@@ -45,6 +46,32 @@ class ClusterTestCase(unittest.TestCase):
 			)
 
 
+	@unittest.skipIf(numpy is None, 'NumPy is needed to vectorize')
+	def test_vectorized(self):
+
+		srs = RecordSet(simpleRecordSet)
+
+		c = Cluster([srs], 'a * 2 + b', 'c', vectorize=True)
+
+		# the expression qualifies, so whole columns are evaluated at once
+		self.assertTrue(c._vectorized)
+
+		self.assertEqual(
+			[[v.c for v in group] for group in c.results.groups],
+			[[2, 5, 6, 9], [10, 13], [14, 17, 18]]
+			)
+
+		srs.extend(simpleAddition)
+
+		self.assertEqual(
+			[[v.c for v in group] for group in c.results.groups],
+			[[2, 5, 6, 9], [10, 13], [14, 17, 18], [23, 24, 27], [28, 31, 32]]
+			)
+
+		# functions that can not be vectorized simply run by row
+		c = Cluster([srs], lambda a,b: a+b, 'c', vectorize=True)
+		self.assertEqual(c._vectorized, None)
+
 
 def runTests():
 	suite = unittest.TestLoader().loadTestsFromTestCase(ClusterTestCase)
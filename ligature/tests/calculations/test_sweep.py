@@ -5,6 +5,7 @@ from ligature.recordset import RecordSet
 from ligature.examples import simpleRecordSet, simpleAddition
 
 from ligature.calculations.sweep import Sweep
+from ligature.vectorize import numpy
 
 
 class SweepTestCase(unittest.TestCase):
@@ -45,6 +46,122 @@ class SweepTestCase(unittest.TestCase):
 			)
 
 
+	def test_uneven_sources(self):
+
+		left = RecordSet([1, 2, 3], recordType='a')
+		right = RecordSet([10], recordType='b')
+
+		c = Sweep([left, right], lambda a,b: a+b, 'c')
+		self.assertEqual([r.c for r in c.results.records], [11])
+
+		# the sources stay aligned once the shorter one catches up
+		right.append([20, 30, 40])
+		left.append([4])
+		self.assertEqual([r.c for r in c.results.records], [11, 22, 33, 44])
+
+
+	def test_object_source(self):
+
+		class Settings(object):
+			k = 100
+
+		srs = RecordSet(recordType='ab')
+		c = Sweep([Settings(), srs], lambda a,k: a+k, 'c')
+
+		# well past how far an Identity scanner iterates on its own
+		for start in range(0, 1500, 5):
+			srs.append([(v, 0) for v in range(start, start + 5)])
+			if start % 500 == 0:
+				_ = c.results
+		self.assertEqual([r.c for r in c.results.records], [v + 100 for v in range(1500)])
+
+
+	def test_shared_source(self):
+
+		srs = RecordSet(simpleRecordSet)
+
+		# both arguments come from one RecordSet, so they're read together
+		c = Sweep([srs], lambda b,a: a-b, 'c')
+		self.assertEqual(len(c.scanners), 1)
+		self.assertEqual(c.scanners[0].fields, ('b', 'a'))
+
+		self.assertEqual(
+			[v.c for v in c.results.records],
+			[1, 1, 3, 3, 5, 5, 7, 7, 9]
+			)
+
+
+	@unittest.skipIf(numpy is None, 'NumPy is needed to vectorize')
+	def test_vectorized(self):
+
+		srs = RecordSet(simpleRecordSet)
+
+		c = Sweep([srs], 'a * 2 + b', 'c', vectorize=True)
+
+		# the expression qualifies, so whole columns are evaluated at once
+		self.assertTrue(c._vectorized)
+
+		self.assertEqual(
+			[[v.c for v in group] for group in c.results.groups],
+			[[2, 5, 6, 9, 10, 13, 14, 17, 18]]
+			)
+
+		srs.extend(simpleAddition)
+
+		self.assertEqual(
+			[[v.c for v in group] for group in c.results.groups],
+			[[2, 5, 6, 9, 10, 13, 14, 17, 18], [23, 24, 27, 28, 31, 32]]
+			)
+
+		# functions that can not be vectorized simply run by row
+		c = Sweep([srs], lambda a,b: a+b, 'c', vectorize=True)
+		self.assertEqual(c._vectorized, None)
+
+
+	@unittest.skipIf(numpy is None, 'NumPy is needed to vectorize')
+	def test_vectorized_matches_rows(self):
+
+		srs = RecordSet(recordType='ab')
+		srs.append([(2, -1), (2, 3), (3, 0)])
+
+		# NumPy refuses negative integer powers, and int64 wraps silently
+		for expression in ('a ** b', 'a * 10**12 * 10**9', 'a * 10**12 * 10**9 / 7'):
+			byRow = Sweep([srs], expression, 'c')
+			vectorized = Sweep([srs], expression, 'c', vectorize=True)
+			self.assertTrue(vectorized._vectorized)
+			self.assertEqual(
+				[v.c for v in vectorized.results.records],
+				[v.c for v in byRow.results.records]
+				)
+
+		# errors are raised just as they are row by row
+		for expression in ('a / b', 'a // b', 'math.sqrt(b)'):
+			vectorized = Sweep([srs], expression, 'c', vectorize=True)
+			self.assertRaises(ArithmeticError if '/' in expression else ValueError,
+							  lambda: vectorized.results)
+
+
+	@unittest.skipIf(numpy is None, 'NumPy is needed to vectorize')
+	def test_vectorized_other_columns(self):
+
+		# strings, big longs (object arrays) and ints mixed with floats
+		for records, expression in (
+				([('x', 'y'), ('z', 'x')], 'a + b'),
+				([('x', 'y'), ('z', 'z')], 'a == b'),
+				([('x', 'y'), ('z', 'w')], 'a * 2'),
+				([(2**64, 1), (2**66, 2)], 'math.sqrt(a)'),
+				([(3, 1), (2.5, 2)], 'a * 2'),
+				):
+			srs = RecordSet(recordType='ab')
+			srs.append(records)
+			byRow = Sweep([srs], expression, 'c')
+			vectorized = Sweep([srs], expression, 'c', vectorize=True)
+			self.assertTrue(vectorized._vectorized)
+
+			results = [v.c for v in vectorized.results.records]
+			self.assertEqual(results, [v.c for v in byRow.results.records])
+			self.assertEqual(map(type, results), [type(v.c) for v in byRow.results.records])
+
 
 def runTests():
 	suite = unittest.TestLoader().loadTestsFromTestCase(SweepTestCase)
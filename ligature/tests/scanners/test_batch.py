@@ -0,0 +1,86 @@
+import unittest
+
+
+from ligature.recordset import RecordSet
+from ligature.examples import simpleRecordSet, simpleAddition
+
+from ligature.storage import RowGroup, ColumnarGroup
+from ligature.scanners.batch import BatchScanner, MultiFieldScanner, alignedBatches
+
+
+class BatchScannerTestCase(unittest.TestCase):
+
+	def test_basic(self):
+
+		srs = RecordSet(simpleRecordSet)
+
+		scanner = BatchScanner(srs, 'a', batchSize=3)
+
+		# runs never cross groups
+		self.assertEqual(
+			[v for v in scanner],
+			[(1, 2, 3), (4,), (5, 6), (7, 8, 9)]
+			)
+		self.assertTrue(scanner.exhausted)
+
+		srs.extend(simpleAddition)
+		self.assertEqual(scanner.take(2), (11, 12))
+		self.assertEqual(scanner.available(), 1)
+		self.assertEqual(scanner.take(), (13,))
+		self.assertEqual(scanner.take(), (14, 15, 16))
+		self.assertEqual(scanner.take(), ())
+
+
+	def test_aligned(self):
+
+		left = RecordSet(simpleRecordSet)
+		right = RecordSet([(10, 20), (30, 40), (50, 60)], recordType='xy')
+
+		scanners = (BatchScanner(left, 'a'), BatchScanner(right, 'x'))
+
+		# runs end wherever either source's group does
+		self.assertEqual(
+			list(alignedBatches(scanners)),
+			[((1, 2, 3), (10, 30, 50))]
+			)
+
+		# nothing is lost from the scanner that had more
+		right.append([(70, 80)])
+		self.assertEqual(
+			list(alignedBatches(scanners, batchSize=2)),
+			[((4,), (70,))]
+			)
+		self.assertEqual(scanners[0].take(), (5, 6))
+
+
+	def test_multiple_fields(self):
+
+		srs = RecordSet(simpleRecordSet)
+
+		scanner = MultiFieldScanner(srs, ('b', 'a'), batchSize=3)
+
+		# one set of cursors, so the fields can't drift apart
+		self.assertEqual(
+			[v for v in scanner],
+			[((0, 1, 0), (1, 2, 3)), ((1,), (4,)), ((0, 1), (5, 6)), ((0, 1, 0), (7, 8, 9))]
+			)
+		self.assertTrue(scanner.exhausted)
+
+		# however the groups are stored, the runs come out the same
+		for groupType in (RowGroup, ColumnarGroup):
+			stored = RecordSet(simpleRecordSet, groupType=groupType)
+			self.assertEqual(
+				[tuple(tuple(run) for run in v) for v in MultiFieldScanner(stored, ('b', 'a'), batchSize=3)],
+				[((0, 1, 0), (1, 2, 3)), ((1,), (4,)), ((0, 1), (5, 6)), ((0, 1, 0), (7, 8, 9))]
+				)
+
+
+
+def runTests():
+	suite = unittest.TestLoader().loadTestsFromTestCase(BatchScannerTestCase)
+	unittest.TextTestRunner(verbosity=2).run(suite)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,9 +4,23 @@ import unittest
 from ligature.recordset import RecordSet
 from ligature.examples import simpleRecordSet, simpleAddition
 
+from ligature.storage import RowGroup
 from ligature.scanners.element import ElementScanner
 
 
+class WatchedGroup(RowGroup):
+	"""Notes which parts of the group get copied out."""
+	reads = []
+
+	def column(self, index):
+		self.reads.append('column')
+		return super(WatchedGroup, self).column(index)
+
+	def columnSlice(self, index, start, stop):
+		self.reads.append((start, stop))
+		return super(WatchedGroup, self).columnSlice(index, start, stop)
+
+
 class ElementScannerTestCase(unittest.TestCase):
 
 	def test_basic(self):
@@ -44,6 +58,68 @@ class ElementScannerTestCase(unittest.TestCase):
 			)
 
 
+	def test_appending_while_scanning(self):
+
+		srs = RecordSet(simpleRecordSet)
+		scanner = ElementScanner(srs,'a')
+
+		values = []
+		for v in scanner:
+			values.append(v)
+			# groups added mid-scan are picked up by the same pass
+			if v == 9:
+				srs.append([(10, 0)])
+		self.assertEqual(values, [1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+
+		# partially scanned groups resume where they stopped
+		srs.append([(20, 0), (21, 0), (22, 0)])
+		self.assertEqual([v for _, v in zip(range(2), scanner)], [20, 21])
+		self.assertEqual([v for v in scanner], [22])
+
+
+	def test_seeking(self):
+
+		srs = RecordSet(simpleRecordSet)
+		scanner = ElementScanner(srs,'a')
+
+		self.assertEqual([v for _, v in zip(range(5), scanner)], [1, 2, 3, 4, 5])
+		self.assertEqual(scanner.position, 5)
+
+		# rewinding jumps back across groups
+		scanner.rewind(3)
+		self.assertEqual(scanner.position, 2)
+		self.assertEqual([v for v in scanner], [3, 4, 5, 6, 7, 8, 9])
+
+		scanner.rewind(100)
+		self.assertEqual(scanner.position, 0)
+
+		scanner.seek(6)
+		self.assertEqual([v for v in scanner], [7, 8, 9])
+		scanner.seek(100)
+		self.assertTrue(scanner.exhausted)
+
+		# positions count from the first record ever added, even after truncating
+		scanner.seek(4)
+		self.assertEqual(srs.truncate(1), 1)
+		self.assertEqual(scanner.position, 4)
+		self.assertEqual([v for v in scanner], [5, 6, 7, 8, 9])
+		self.assertRaises(ValueError, scanner.seek, 3)
+
+
+	def test_resume_copies(self):
+
+		srs = RecordSet([(v, 0) for v in range(1000)], recordType='ab', groupType=WatchedGroup)
+		scanner = ElementScanner(srs, 'a')
+
+		del WatchedGroup.reads[:]
+		self.assertEqual([scanner.next() for _ in range(50)], range(50))
+
+		# each resume reads on from the cursor, never the whole column again
+		self.assertFalse('column' in WatchedGroup.reads)
+		self.assertEqual([start for start, stop in WatchedGroup.reads], range(50))
+		self.assertTrue(all(stop - start < 1000 for start, stop in WatchedGroup.reads))
+
+
 
 def runTests():
 	suite = unittest.TestLoader().loadTestsFromTestCase(ElementScannerTestCase)
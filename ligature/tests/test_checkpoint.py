@@ -0,0 +1,120 @@
+import unittest
+import os, tempfile
+
+from ligature.recordset import RecordSet
+from ligature.view import RecordSetView
+from ligature.checkpoint import checkpoint, restore, save, load
+from ligature.combiner import Sum
+
+from ligature.calculations.sweep import Sweep
+from ligature.calculations.aggregate import IncrementalAggregate
+from ligature.scanners.replaying import ReplayingElementScanner
+
+
+class CheckpointTestCase(unittest.TestCase):
+
+	def buildGraph(self):
+		calls = []
+		def double(a):
+			calls.append(a)
+			return a * 2
+		srs = RecordSet(recordType='ab')
+		sweep = Sweep([srs], double, 'x')
+		total = IncrementalAggregate([sweep], [Sum('x')], 'o')
+		return srs, sweep, total, calls
+
+
+	def test_resume(self):
+
+		srs, sweep, total, calls = self.buildGraph()
+		srs.append([(1, 0), (2, 0)])
+		srs.append([(3, 0)])
+		self.assertEqual(total.results[0].o, 12)
+
+		path = tempfile.mktemp(suffix='.checkpoint')
+		try:
+			save(path, total)
+
+			# as if after a restart
+			srs, sweep, total, calls = self.buildGraph()
+			load(path, total)
+		finally:
+			os.remove(path)
+
+		self.assertEqual([r._tuple for r in srs.records], [(1, 0), (2, 0), (3, 0)])
+		self.assertEqual(total.results[0].o, 12)
+		self.assertEqual(calls, [])
+
+		# only what is new gets calculated
+		srs.append([(4, 0)])
+		self.assertEqual(total.results[0].o, 20)
+		self.assertEqual(calls, [4])
+		self.assertEqual([r.x for r in sweep.results.records], [2, 4, 6, 8])
+
+
+	def test_truncated(self):
+
+		srs = RecordSet([(1, 0), (2, 0)], recordType='ab')
+		srs.append([(3, 0)])
+		scanner = ReplayingElementScanner(srs, 'a')
+		self.assertEqual([v for v in scanner], [1, 2, 3])
+		scanner.anchor()
+		srs.append([(4, 0)])
+		self.assertEqual(srs.truncate(1), 1)
+
+		# group cursors count from the first group ever added
+		state = srs.checkpoint()
+		cursors = scanner.checkpoint()
+		self.assertEqual(cursors['group'], 2)
+		self.assertEqual(cursors['groupAnchor'], 2)
+
+		copy = RecordSet(recordType='ab')
+		copy.restore(state)
+		self.assertEqual(copy._removedRecords, 2)
+		copyScanner = ReplayingElementScanner(copy, 'a')
+		copyScanner.restore(cursors)
+		self.assertEqual([v for v in copyScanner], [4])
+		# not anchored, so it replays
+		self.assertEqual([v for v in copyScanner], [4])
+
+		self.assertRaises(ValueError, RecordSet(recordType='xy').restore, state)
+
+
+	def test_different_graph(self):
+
+		srs, sweep, total, calls = self.buildGraph()
+		state = checkpoint(total)
+		self.assertRaises(ValueError, restore, state, sweep)
+
+
+	def test_view(self):
+
+		def buildGraph():
+			srs = RecordSet(recordType='ab')
+			view = RecordSetView(srs, 1)
+			sweep = Sweep([view], lambda a, b: a + b, 'x')
+			return srs, view, sweep
+
+		srs, view, sweep = buildGraph()
+		srs.append([(1, 0), (2, 1)])
+		self.assertEqual([r.x for r in sweep.results.records], [3])
+
+		state = checkpoint(sweep)
+
+		# the viewed RecordSet is saved, not just the view
+		srs, view, sweep = buildGraph()
+		restore(state, sweep)
+		self.assertEqual([r._tuple for r in view.records], [(2, 1)])
+
+		srs.append([(7, 3)])
+		self.assertEqual([r.x for r in sweep.results.records], [3, 10])
+
+
+def runTests():
+	suite = unittest.TestLoader().loadTestsFromTestCase(CheckpointTestCase)
+	unittest.TextTestRunner(verbosity=2).run(suite)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import threading, time
+
+from ligature._compat import memoize
+
+
+class MemoizeTestCase(unittest.TestCase):
+
+	def setUp(self):
+		self.calls = []
+
+
+	def test_unbounded(self):
+
+		@memoize
+		def square(x):
+			self.calls.append(x)
+			return x * x
+
+		self.assertEqual([square(x) for x in (1, 2, 1, 2)], [1, 4, 1, 4])
+		self.assertEqual(self.calls, [1, 2])
+		self.assertEqual(square.cache_info()['hits'], 2)
+
+		self.assertEqual(square.__name__, 'square')
+		self.assertEqual(len(square.cache), 2)
+
+
+	def test_eviction(self):
+
+		@memoize(maxsize=2)
+		def square(x):
+			self.calls.append(x)
+			return x * x
+
+		for x in (1, 2, 1, 3, 2):
+			_ = square(x)
+		# 2 was least recently used when 3 came in
+		self.assertEqual(self.calls, [1, 2, 3, 2])
+		self.assertEqual(square.cache_info(), {'hits': 1, 'misses': 4, 'evictions': 2, 'size': 2, 'maxsize': 2})
+
+
+	def test_expiry(self):
+
+		@memoize(ttl=0)
+		def square(x):
+			self.calls.append(x)
+			return x * x
+
+		_ = square(3)
+		_ = square(3)
+		self.assertEqual(self.calls, [3, 3])
+		self.assertEqual(square.cache_info()['evictions'], 1)
+		# the timeout table only tracks what is cached
+		self.assertEqual(len(square.timeout), 1)
+
+		square.cache_clear()
+		self.assertEqual(len(square.timeout), 0)
+
+
+	def test_unhashable(self):
+
+		@memoize
+		def total(values):
+			self.calls.append(values)
+			return sum(values)
+
+		self.assertEqual(total([1, 2]), 3)
+		self.assertEqual(total([1, 2]), 3)
+		self.assertEqual(len(self.calls), 2)
+
+
+	def test_concurrent(self):
+
+		@memoize
+		def slow(x):
+			self.calls.append(x)
+			time.sleep(0.05)
+			return x * 2
+
+		results = []
+		threads = [threading.Thread(target=lambda: results.append(slow(4))) for _ in range(5)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+		# everyone waited on the one computation
+		self.assertEqual(self.calls, [4])
+		self.assertEqual(results, [8] * 5)
+
+
+	def test_concurrent_errors(self):
+
+		@memoize
+		def broken(x):
+			self.calls.append(x)
+			time.sleep(0.05)
+			raise KeyError(x)
+
+		errors = []
+		def call():
+			try:
+				broken(1)
+			except KeyError:
+				errors.append(1)
+		threads = [threading.Thread(target=call) for _ in range(3)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+		self.assertEqual(self.calls, [1])
+		self.assertEqual(errors, [1, 1, 1])
+		# failures aren't cached
+		self.assertRaises(KeyError, broken, 1)
+		self.assertEqual(self.calls, [1, 1])
+
+
+
+def runTests():
+	suite = unittest.TestLoader().loadTestsFromTestCase(MemoizeTestCase)
+	unittest.TextTestRunner(verbosity=2).run(suite)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
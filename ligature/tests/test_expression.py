@@ -1,7 +1,8 @@
 import unittest
-import math
+import math, sys, types
 
-from ligature.expression import convert_to_postfix, Expression
+from ligature.expression import convert_to_postfix, Expression, MalformedExpression, expression_cache
+from ligature._compat import LRUCache
 
 
 class ExpressionTestCase(unittest.TestCase):
@@ -78,6 +79,85 @@ class ExpressionTestCase(unittest.TestCase):
 		self.assertEqual(expression(*(1,2,4),**dict(a=10,b=20,c=40)), 810)
 
 
+	def test_compiled(self):
+
+		expression = Expression( 'a + b * c' )
+
+		# the postfix stack becomes a single function of the arguments
+		self.assertEqual(expression._eval_func.__code__.co_varnames[:3], ('a', 'b', 'c'))
+		self.assertEqual(expression._eval_func(1,2,4), 9)
+
+		# and matches the resolved lambdas
+		resolved = Expression.__new__(Expression)
+		resolved._resolve_function(expression._postfix)
+		self.assertEqual(resolved._fields, expression._fields)
+		self.assertEqual(resolved(1,2,4), expression(1,2,4))
+
+		# arguments can be used more than once
+		self.assertEqual(Expression( 'a * a' )(3), 9)
+		self.assertEqual(Expression( 'math.sqrt(a*a + b*b)' )(3,4), 5.0)
+
+
+	def test_caching(self):
+
+		expression_cache.clear()
+		hits = expression_cache.hits
+
+		first = Expression( 'a * 3 - b' )
+		second = Expression( 'a * 3 - b' )
+
+		# the second one skips parsing and shares the compiled function
+		self.assertEqual(expression_cache.hits, hits + 1)
+		self.assertTrue(first._eval_func is second._eval_func)
+		self.assertEqual(second(2,1), 5)
+
+		# the cache is bounded, dropping the least recently used first
+		cache = LRUCache(maxsize=2)
+		cache.put('a', 1)
+		cache.put('b', 2)
+		self.assertEqual(cache.get('a'), 1)
+		cache.put('c', 3)
+		self.assertFalse('b' in cache)
+		self.assertEqual(cache.get('b'), None)
+		self.assertEqual(cache.stats, {'hits': 1, 'misses': 1, 'evictions': 1, 'size': 2, 'maxsize': 2})
+
+
+	def test_reloaded_shared(self):
+
+		def sharedModule(factor):
+			module = types.ModuleType('shared')
+			module.scale = lambda x: x * factor
+			module.offset = factor
+			return module
+
+		previous = sys.modules.get('shared')
+		sys.modules['shared'] = sharedModule(2)
+		try:
+			self.assertEqual(Expression('shared.offset + shared.scale(a)')(3), 8)
+			self.assertTrue(Expression('shared.offset + shared.scale(a)')._eval_func)
+
+			# a reload swaps out the module, and cached expressions follow it
+			sys.modules['shared'] = sharedModule(10)
+			self.assertEqual(Expression('shared.offset + shared.scale(a)')(3), 40)
+		finally:
+			if previous is None:
+				del sys.modules['shared']
+			else:
+				sys.modules['shared'] = previous
+
+
+	def test_malformed(self):
+
+		# two values with nothing joining them can't be one expression
+		self.assertRaises(MalformedExpression, Expression, 'a b')
+		# nor can Python statements and keywords that aren't operators
+		self.assertRaises(MalformedExpression, Expression, 'a if b else c')
+
+		# operators that are keywords are still fine
+		self.assertEqual(Expression( 'not a' )(0), True)
+		self.assertEqual(Expression( 'a and b' )(1, 0), 0)
+
+
 	def test_safety(self):
 		pass
 
@@ -0,0 +1,97 @@
+import unittest
+
+from ligature.recordset import RecordSet
+from ligature.projection import pushdown
+
+from ligature.transforms.merge import Merge
+from ligature.transforms.collation import Collation
+from ligature.calculations.sweep import Sweep
+
+
+class PushdownTestCase(unittest.TestCase):
+
+	def test_merge(self):
+
+		rs1 = RecordSet([(1, 10, 100), (2, 20, 200)], recordType='abc')
+		rs2 = RecordSet([(3, 30), (4, 40)], recordType='de')
+
+		merge = Merge([rs1, rs2])
+		self.assertEqual(merge._resultset._RecordType._fields, ('a', 'b', 'c', 'd', 'e'))
+
+		total = Sweep([merge], lambda a, d: a + d, 'x')
+		self.assertEqual(pushdown(total), [merge])
+
+		self.assertEqual(merge._resultset._RecordType._fields, ('a', 'd'))
+		self.assertEqual(len(merge.scanners), 2)
+		self.assertEqual([r.x for r in total.results], [4, 6])
+
+		# nothing left to narrow
+		self.assertEqual(pushdown(total), [])
+
+
+	def test_merge_lengths(self):
+
+		rs1 = RecordSet([(1, 10), (2, 20), (3, 30)], recordType='ab')
+		rs2 = RecordSet([(4, 40), (5, 50)], recordType='cd')
+
+		merge = Merge([rs1, rs2])
+		calc = Sweep([merge], lambda a: a, 'x')
+		unprojected = Sweep([Merge([rs1, rs2])], lambda a: a, 'x')
+
+		self.assertEqual(pushdown(calc), [merge])
+		self.assertEqual(merge._resultset._RecordType._fields, ('a',))
+
+		# the shorter source is still scanned, so it still ends the merge
+		self.assertEqual(len(merge.scanners), 2)
+		self.assertEqual([r.x for r in calc.results], [r.x for r in unprojected.results])
+		self.assertEqual([r.x for r in calc.results], [1, 2])
+
+
+	def test_shared(self):
+
+		rs1 = RecordSet([(1, 10, 100), (2, 20, 200)], recordType='abc')
+
+		merge = Merge([rs1])
+		first = Sweep([merge], lambda a: a * 2, 'x')
+		second = Sweep([merge], lambda b: b * 2, 'y')
+
+		pushdown(first, second)
+		self.assertEqual(merge._resultset._RecordType._fields, ('a', 'b'))
+		self.assertEqual([r.x for r in first.results], [2, 4])
+		self.assertEqual([r.y for r in second.results], [20, 40])
+
+
+	def test_collation(self):
+
+		rs1 = RecordSet([(1, 10, 100), (3, 30, 300)], recordType='tab')
+		rs2 = RecordSet([(2, 5)], recordType='tc')
+
+		collation = Collation([rs1, rs2], 't')
+		calc = Sweep([collation], lambda t, c: c, 'o')
+
+		self.assertEqual(pushdown(calc), [collation])
+		self.assertEqual(collation._resultset._RecordType._fields, ('t', 'c'))
+		# the first source has no fields left, but its records still make rows
+		self.assertEqual(len(collation.scanners), 2)
+		self.assertEqual([r.o for r in calc.results], [None, 5, 5])
+
+
+	def test_sinks(self):
+
+		rs1 = RecordSet([(1, 10, 100)], recordType='abc')
+		merge = Merge([rs1])
+
+		# without consumers, there is no telling what is needed
+		self.assertEqual(pushdown(merge), [])
+		self.assertEqual(merge._resultset._RecordType._fields, ('a', 'b', 'c'))
+
+
+
+def runTests():
+	suite = unittest.TestLoader().loadTestsFromTestCase(PushdownTestCase)
+	unittest.TextTestRunner(verbosity=2).run(suite)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import gc, weakref
 
 from ligature.record import genRecordType
 
@@ -63,6 +64,40 @@ class GenerateRecordTypeTestCase(unittest.TestCase):
 		self.assertEqual(r.values, (1, 2, 3))
 
 
+	def test_getters(self):
+
+		R = genRecordType('abc')
+		r = R( (1,2,3) )
+
+		self.assertEqual(R.getGetter('b')(r), 2)
+		self.assertEqual(R.getTupleGetter('b')(r._tuple), 2)
+		self.assertEqual(R.getTupleGetter('c', 'a')(r._tuple), (3, 1))
+		self.assertEqual(map(R.getTupleGetter('a', 'b'), [(1,2,3), (4,5,6)]), [(1, 2), (4, 5)])
+
+
+	def test_same_class(self):
+
+		R = genRecordType('abc')
+		r = R( (1,2,3) )
+
+		# however many other headers come along, records keep matching their type
+		for ix in range(1000):
+			_ = genRecordType(('x%d' % ix,))
+		self.assertTrue(genRecordType('abc') is R)
+		self.assertTrue(isinstance(r, genRecordType('abc')))
+
+
+	def test_released(self):
+
+		R = genRecordType(('released', 'header'))
+		collected = weakref.ref(R)
+
+		# once nothing uses the class, it is let go
+		del R
+		gc.collect()
+		self.assertTrue(collected() is None)
+
+
 def runTests():
 	suite = unittest.TestLoader().loadTestsFromTestCase(GenerateRecordTypeTestCase)
 	unittest.TextTestRunner(verbosity=2).run(suite)
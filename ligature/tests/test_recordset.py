@@ -0,0 +1,247 @@
+import unittest
+
+from ligature.recordset import RecordSet, Retention
+from ligature.examples import simpleRecordSet, simpleAddition
+
+from ligature.scanners.element import ElementScanner
+from ligature.scanners.replaying import ReplayingElementScanner
+
+
+class IndexingTestCase(unittest.TestCase):
+
+	def test_integers(self):
+
+		srs = RecordSet(simpleRecordSet)
+		srs.append([])
+		srs.append([(10, 1)])
+
+		values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+		for ix in range(-len(values), len(values)):
+			self.assertEqual(srs[ix].a, values[ix])
+
+		self.assertRaises(IndexError, lambda: srs[10])
+		self.assertRaises(IndexError, lambda: srs[-11])
+
+
+	def test_slices(self):
+
+		srs = RecordSet(simpleRecordSet)
+		srs.append([])
+		srs.append([(10, 1)])
+
+		values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+		for selector in (slice(None), slice(3, 7), slice(-3, None), slice(-4, -1),
+						 slice(1, None, 3), slice(None, None, -1), slice(8, 2, -2), slice(5, 2)):
+			self.assertEqual([r.a for r in srs[selector]], values[selector])
+
+
+	def test_maintained(self):
+
+		srs = RecordSet(recordType='ab', retention=Retention(maxGroups=2))
+		for i in range(4):
+			srs.append([(i, 0), (i, 1), (i, 2)])
+		self.assertEqual(srs._offsets, [0, 3, 6])
+		self.assertEqual(srs[-1]._tuple, (3, 2))
+		self.assertEqual(srs[3]._tuple, (3, 0))
+
+		srs._extendLastGroup([(3, 3)])
+		self.assertEqual(srs._offsets, [0, 3, 7])
+		self.assertEqual(srs[-1]._tuple, (3, 3))
+
+		srs.clear()
+		self.assertRaises(IndexError, lambda: srs[0])
+
+
+	def test_counts(self):
+
+		srs = RecordSet(simpleRecordSet)
+		self.assertEqual(srs.record_count, 9)
+		self.assertEqual(srs.offsets, (0, 4, 6))
+
+		srs.append([(10, 1)])
+		srs.extend(simpleAddition)
+		self.assertEqual(srs.record_count, 16)
+		self.assertEqual(srs.offsets, (0, 4, 6, 9, 10, 13))
+
+		srs.truncate(2)
+		self.assertEqual(srs.record_count, 10)
+		self.assertEqual(srs.offsets, (0, 3, 4, 7))
+
+		srs.clear()
+		self.assertEqual(srs.record_count, 0)
+		self.assertEqual(srs.offsets, ())
+
+
+
+class HashIndexTestCase(unittest.TestCase):
+
+	def test_membership(self):
+
+		srs = RecordSet(simpleRecordSet)
+		R = srs._RecordType
+
+		# the same answers, with and without the index
+		for indexed in (False, True):
+			if indexed:
+				srs.addIndex()
+			self.assertTrue(R((6, 1)) in srs)
+			self.assertFalse(R((6, 0)) in srs)
+			self.assertEqual(srs.count(R((7, 0))), 1)
+			self.assertEqual(srs.index(R((7, 0))), 2)
+			self.assertRaises(ValueError, srs.index, R((6, 0)))
+
+		srs.append([(6, 0), (7, 0)])
+		self.assertTrue(R((6, 0)) in srs)
+		self.assertEqual(srs.count(R((7, 0))), 2)
+		self.assertEqual(srs.index(R((7, 0))), 3)
+		self.assertEqual(srs.index(R((7, 0)), fromTop=False), 2)
+
+
+	def test_lookup(self):
+
+		srs = RecordSet(simpleRecordSet)
+		expected = [(2, 1), (4, 1), (6, 1), (8, 1)]
+
+		self.assertEqual([r._tuple for r in srs.lookup(b=1)], expected)
+		srs.addIndex('b')
+		self.assertEqual([r._tuple for r in srs.lookup(b=1)], expected)
+		self.assertEqual(srs.lookup(b=2), [])
+
+		srs.extend(simpleAddition)
+		self.assertEqual(srs.addIndex('b').count((1,)), 7)
+
+		srs.truncate(3)
+		self.assertEqual(
+			[r._tuple for r in srs.lookup(b=1)], 
+			[(11, 1), (13, 1), (15, 1)] )
+
+		srs.clear()
+		self.assertEqual(srs.lookup(b=1), [])
+
+
+
+class SortedTestCase(unittest.TestCase):
+
+	def test_validation(self):
+
+		srs = RecordSet(recordType='tv', sortKey='t')
+		srs.append([(1, 0), (2, 0)])
+		srs.append([(2, 1)])
+		self.assertRaises(ValueError, srs.append, [(3, 0), (1, 0)])
+		self.assertRaises(ValueError, srs.append, [(0, 0)])
+		self.assertEqual(srs.record_count, 3)
+
+		self.assertRaises(ValueError, RecordSet, [(2, 0), (1, 0)], recordType='tv', sortKey='t')
+
+
+	def test_range(self):
+
+		srs = RecordSet(recordType='tv', sortKey='t')
+		srs.append([(0, 0), (1, 0), (1, 1), (2, 0)])
+		srs.append([])
+		srs.append([(2, 1), (4, 0)])
+		srs.append([(5, 0), (7, 0), (9, 0)])
+
+		def ts(view):
+			return [r.t for r in view]
+
+		self.assertEqual(ts(srs.range('t', 1, 5)), [1, 1, 2, 2, 4])
+		self.assertEqual(ts(srs.range('t', 2, 3)), [2, 2])
+		self.assertEqual(ts(srs.range('t', 3, 4)), [])
+		self.assertEqual(ts(srs.range('t', None, 1)), [0])
+		self.assertEqual(ts(srs.range('t', 6)), [7, 9])
+		self.assertEqual(ts(srs.range('t', 10)), [])
+		self.assertEqual(ts(srs.range('t', 5, 2)), [])
+
+		view = srs.range('t', 1, 6)
+		self.assertEqual(view.record_count, 6)
+		self.assertEqual(view[-1].t, 5)
+		self.assertEqual([tuple(r.t for r in group) for group in view.groups], [(1, 1, 2), (), (2, 4), (5,)])
+
+		self.assertRaises(ValueError, srs.range, 'v', 0, 1)
+
+
+
+class RetentionTestCase(unittest.TestCase):
+
+	def test_noPolicy(self):
+
+		srs = RecordSet(simpleRecordSet)
+		self.assertEqual(srs.truncate(), 0)
+		self.assertEqual(len(srs._groups), 3)
+
+		# asking explicitly still works without a policy
+		self.assertEqual(srs.truncate(1), 1)
+		self.assertEqual(
+			[r._tuple for r in srs],
+			[(5, 0), (6, 1), (7, 0), (8, 1), (9, 0)] )
+
+
+	def test_limits(self):
+
+		srs = RecordSet(recordType='ab', retention=Retention(maxGroups=2))
+		for i in range(5):
+			srs.append([(i, 0), (i, 1)])
+		self.assertEqual([g[0].a for g in srs._groups], [3, 4])
+
+		srs = RecordSet(recordType='ab', retention=Retention(maxRecords=5))
+		for i in range(5):
+			srs.append([(i, 0), (i, 1)])
+		# only whole groups are dropped
+		self.assertEqual([g[0].a for g in srs._groups], [3, 4])
+
+		srs = RecordSet(recordType='ab', retention=Retention(maxAge=10, keyField='a'))
+		for t in (0, 5, 12, 20, 40):
+			srs.append([(t, 0)])
+		self.assertEqual([g[0].a for g in srs._groups], [40])
+
+
+	def test_scanners(self):
+
+		srs = RecordSet(recordType='ab', retention=Retention(maxGroups=1))
+		scanner = ElementScanner(srs, 'a')
+
+		srs.append([(1, 0), (2, 0)])
+		srs.append([(3, 0)])
+		# nothing was read yet, so everything stays
+		self.assertEqual(len(srs._groups), 2)
+
+		self.assertEqual([v for v in scanner], [1, 2, 3])
+		self.assertEqual(srs.truncate(), 1)
+		self.assertEqual(scanner._group_cursor, 1)
+
+		srs.append([(4, 0)])
+		self.assertEqual([v for v in scanner], [4])
+		self.assertEqual([g[0].a for g in srs._groups], [4])
+
+
+	def test_replaying(self):
+
+		srs = RecordSet(recordType='ab', retention=Retention(maxGroups=1))
+		scanner = ReplayingElementScanner(srs, 'a')
+
+		srs.append([(1, 0)])
+		srs.append([(2, 0)])
+		self.assertEqual([v for v in scanner], [1, 2])
+
+		# the scanner may replay from the anchor, so keep what it needs
+		srs.append([(3, 0)])
+		self.assertEqual(len(srs._groups), 3)
+		self.assertEqual([v for v in scanner], [1, 2, 3])
+
+		scanner.anchor()
+		self.assertEqual(srs.truncate(), 2)
+		srs.append([(4, 0)])
+		self.assertEqual([v for v in scanner], [4])
+
+
+
+def runTests():
+	for testCase in (IndexingTestCase, HashIndexTestCase, SortedTestCase, RetentionTestCase):
+		suite = unittest.TestLoader().loadTestsFromTestCase(testCase)
+		unittest.TextTestRunner(verbosity=2).run(suite)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
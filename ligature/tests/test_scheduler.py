@@ -0,0 +1,92 @@
+import unittest
+
+from ligature.recordset import RecordSet
+from ligature._compat import ThreadPool
+from ligature.scheduler import Scheduler, topologicalOrder
+
+from ligature.transforms.merge import Merge
+from ligature.calculations.sweep import Sweep
+
+
+class CountingSweep(Sweep):
+	"""Counts how often it is calculated."""
+
+	def calculate(self):
+		self.metadata['runs'] += 1
+		super(CountingSweep, self).calculate()
+
+
+class SchedulerTestCase(unittest.TestCase):
+
+	def setUp(self):
+		# a diamond: one source read by two branches that merge again
+		self.srs = RecordSet([(1, 10), (2, 20)], recordType='ab')
+		self.top = CountingSweep([self.srs], lambda a, b: a + b, 's', metadata={'runs': 0})
+		self.left = CountingSweep([self.top], lambda s: s * 2, 'l', metadata={'runs': 0})
+		self.right = CountingSweep([self.top], lambda s: s * 3, 'r', metadata={'runs': 0})
+		self.bottom = Merge([self.left, self.right])
+
+
+	def test_order(self):
+
+		order = topologicalOrder([self.bottom])
+		self.assertEqual(len(order), 4)
+		self.assertEqual(order[0], self.top)
+		self.assertEqual(order[-1], self.bottom)
+
+
+	def test_once(self):
+
+		scheduler = Scheduler(self.bottom)
+		self.assertEqual(len(scheduler.plan()), 4)
+
+		self.assertEqual(len(scheduler.run()), 4)
+		self.assertEqual(self.top.metadata['runs'], 1)
+		self.assertEqual([(r.l, r.r) for r in self.bottom.results], [(22, 33), (44, 66)])
+
+		# nothing to do until the source changes
+		self.assertEqual(scheduler.plan(), [])
+		self.assertEqual(scheduler.run(), [])
+
+		self.srs.append([(3, 30)])
+		self.assertEqual(scheduler.plan()[0], self.top)
+		scheduler.run()
+		self.assertEqual([node.metadata['runs'] for node in (self.top, self.left, self.right)], [2, 2, 2])
+		self.assertEqual([(r.l, r.r) for r in self.bottom.results][-1], (66, 99))
+
+
+	def test_concurrent(self):
+
+		pool = ThreadPool(maxWorkers=2)
+		try:
+			scheduler = Scheduler(self.bottom, executor=pool)
+			self.assertEqual(len(scheduler.run()), 4)
+			self.assertEqual([node.metadata['runs'] for node in (self.top, self.left, self.right)], [1, 1, 1])
+			self.assertEqual([(r.l, r.r) for r in self.bottom.results], [(22, 33), (44, 66)])
+
+			self.srs.append([(3, 30)])
+			self.bottom.apply(executor=pool)
+			self.assertEqual([node.metadata['runs'] for node in (self.top, self.left, self.right)], [2, 2, 2])
+			self.assertEqual([(r.l, r.r) for r in self.bottom.results][-1], (66, 99))
+		finally:
+			pool.shutdown()
+
+
+	def test_process_pool_rejected(self):
+
+		class ProcessPoolExecutor(object):
+			def submit(self, function, *args):
+				pass
+
+		self.assertRaises(ValueError, Scheduler, self.bottom, executor=ProcessPoolExecutor())
+
+
+
+def runTests():
+	suite = unittest.TestLoader().loadTestsFromTestCase(SchedulerTestCase)
+	unittest.TextTestRunner(verbosity=2).run(suite)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+from array import array
+
+from ligature.recordset import RecordSet
+from ligature.record import genRecordType
+from ligature.storage import ColumnarGroup, RowGroup
+from ligature.examples import simpleRecordSet, simpleAddition
+
+from ligature.scanners.element import ElementScanner
+from ligature.scanners.chunk import ChunkScanner
+
+
+class ColumnarGroupTestCase(unittest.TestCase):
+
+	def test_packing(self):
+
+		R = genRecordType('abc')
+		group = ColumnarGroup.fromRows(R, [(1, 1.5, 'x'), (2, 2.5, 'y')])
+
+		# homogeneous numbers are packed into arrays
+		self.assertEqual(group.column(0), array('l', [1, 2]))
+		self.assertEqual(group.column(1), array('d', [1.5, 2.5]))
+		self.assertEqual(group.column(2), ('x', 'y'))
+
+		# records are only made when asked for
+		self.assertEqual(len(group), 2)
+		self.assertEqual(group[1]._tuple, (2, 2.5, 'y'))
+		self.assertEqual(group[-2]._tuple, (1, 1.5, 'x'))
+		self.assertEqual([r._tuple for r in group], [(1, 1.5, 'x'), (2, 2.5, 'y')])
+		self.assertEqual([r._tuple for r in group[1:]], [(2, 2.5, 'y')])
+
+
+	def test_recordset(self):
+
+		srs = RecordSet(simpleRecordSet, groupType=ColumnarGroup)
+		self.assertTrue(all(isinstance(group, ColumnarGroup) for group in srs._groups))
+
+		# records still come out like any other RecordSet
+		self.assertEqual(
+			[r._tuple for r in srs],
+			[r._tuple for r in simpleRecordSet] )
+		self.assertEqual(srs[4]._tuple, (5, 0))
+		self.assertEqual(srs[-1]._tuple, (9, 0))
+		self.assertEqual(
+			[tuple(group) for group in srs['a',:]],
+			[(1, 2, 3, 4), (5, 6), (7, 8, 9)] )
+
+		# extending converts to the RecordSet's storage
+		srs.extend(simpleAddition)
+		self.assertTrue(isinstance(srs._groups[-1], ColumnarGroup))
+
+		srs.append([(17, 1)])
+		self.assertEqual(srs[-1]._tuple, (17, 1))
+
+		# short rows are refused, just as records would be, not cut down
+		self.assertRaises(AssertionError, srs.append, [(18, 0), (19,)])
+		self.assertEqual(srs[-1]._tuple, (17, 1))
+
+
+	def test_scanners(self):
+
+		srs = RecordSet(simpleRecordSet, groupType=ColumnarGroup)
+
+		self.assertEqual(
+			[v for v in ElementScanner(srs, 'a')],
+			[1, 2, 3, 4, 5, 6, 7, 8, 9] )
+
+		self.assertEqual(
+			[v for v in ChunkScanner(srs, 'b')],
+			[(0, 1, 0, 1), (0, 1), (0, 1, 0)] )
+
+
+class RowGroupTestCase(unittest.TestCase):
+
+	def test_rows(self):
+
+		R = genRecordType('abc')
+		group = RowGroup.fromRows(R, [(1, 1.5, 'x'), (2, 2.5, 'y')])
+
+		self.assertEqual(group.column(2), ('x', 'y'))
+		self.assertEqual(list(group.rows()), [(1, 1.5, 'x'), (2, 2.5, 'y')])
+		self.assertEqual(group[-1]._tuple, (2, 2.5, 'y'))
+		self.assertTrue((1, 1.5, 'x') in group)
+
+
+	def test_recordset(self):
+
+		srs = RecordSet([(1, 0), (2, 1)], recordType='ab', groupType=RowGroup)
+		srs.extend(simpleAddition)
+		srs.append([(17, 1)])
+		self.assertTrue(all(isinstance(group, RowGroup) for group in srs._groups))
+
+		self.assertEqual(
+			[v for v in ElementScanner(srs, 'a')],
+			[1, 2] + [r.a for r in simpleAddition] + [17] )
+		self.assertEqual(
+			[v for v in ChunkScanner(srs, 'b')][0],
+			(0, 1) )
+		self.assertEqual(srs[-1]._tuple, (17, 1))
+		self.assertEqual(srs.index(srs[-1]), 3)
+
+		# malformed rows are caught on the way in, not later in a scanner
+		self.assertRaises(AssertionError, srs.append, [(18, 0), (19, 0, 0)])
+		self.assertRaises(AssertionError, RowGroup, genRecordType('ab'), [(1,)])
+
+
+
+def runTests():
+	suite = unittest.TestLoader().loadTestsFromTestCase(ColumnarGroupTestCase)
+	unittest.TextTestRunner(verbosity=2).run(suite)
+	suite = unittest.TestLoader().loadTestsFromTestCase(RowGroupTestCase)
+	unittest.TextTestRunner(verbosity=2).run(suite)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+
+from ligature.recordset import RecordSet
+from ligature.stream import Ingestor
+
+from ligature.calculations.sweep import Sweep
+
+
+class SlowSource(object):
+	"""Has a group ready every other poll."""
+
+	def __init__(self, groups):
+		self.groups = list(groups)
+		self.polls = 0
+
+	def poll(self):
+		self.polls += 1
+		if not self.groups:
+			raise StopIteration
+		if self.polls % 2:
+			return None
+		return self.groups.pop(0)
+
+
+def feed(groups):
+	for group in groups:
+		yield None
+		yield group
+
+
+class IngestorTestCase(unittest.TestCase):
+
+	def setUp(self):
+		self.srs = RecordSet(recordType='ab')
+
+
+	def test_pump(self):
+
+		ingestor = Ingestor(self.srs, [SlowSource([[(1, 2)], [(3, 4)]]), feed([[(5, 6)]])])
+		self.assertEqual(ingestor.sources, 2)
+
+		# neither has anything on the first poll
+		self.assertEqual(ingestor.pumpOnce(), 0)
+		self.assertEqual(ingestor.pumpOnce(), 2)
+		self.assertEqual(self.srs.record_count, 0)
+
+		self.assertEqual(ingestor.drain(), 2)
+		self.assertEqual(len(self.srs._groups), 2)
+
+		while ingestor.sources:
+			_ = ingestor.pumpOnce()
+		self.assertEqual(ingestor.drain(), 1)
+		self.assertEqual(sorted(r._tuple for r in self.srs.records), [(1, 2), (3, 4), (5, 6)])
+		self.assertTrue(ingestor.finished)
+
+
+	def test_backpressure(self):
+
+		ingestor = Ingestor(self.srs, [feed([[(i, i)] for i in range(10)])], maxPending=3, interval=0.01)
+		ingestor.start()
+		appended = 0
+		while not ingestor.finished:
+			appended += ingestor.drain(block=True, timeout=1)
+			self.assertTrue(ingestor._pending.qsize() <= 3)
+		ingestor.stop()
+		self.assertEqual(appended, 10)
+		self.assertEqual([r.a for r in self.srs.records], list(range(10)))
+
+
+	def test_errors(self):
+
+		def broken():
+			yield [(1, 1)]
+			raise KeyError('feed went away')
+
+		ingestor = Ingestor(self.srs, [broken()])
+		_ = ingestor.pumpOnce()
+		_ = ingestor.pumpOnce()
+		self.assertEqual(ingestor.sources, 0)
+		self.assertRaises(KeyError, ingestor.drain)
+		# what arrived before the error is kept
+		self.assertEqual(self.srs.record_count, 1)
+
+
+	def test_result_stream(self):
+
+		sweep = Sweep([self.srs], lambda a, b: a + b, 'x')
+		self.srs.append([(1, 1)])
+
+		ingestor = Ingestor(self.srs, [feed([[(2, 2)], [(3, 3), (4, 4)]])], interval=0.01)
+		ingestor.start()
+		sums = [[r.x for r in group] for group in sweep.stream(ingestor, timeout=1)]
+		ingestor.stop()
+		self.assertEqual(sum(sums, []), [2, 4, 6, 8])
+
+
+
+def runTests():
+	suite = unittest.TestLoader().loadTestsFromTestCase(IngestorTestCase)
+	unittest.TextTestRunner(verbosity=2).run(suite)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
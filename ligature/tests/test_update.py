@@ -0,0 +1,108 @@
+from __future__ import with_statement
+import unittest
+import threading
+
+from ligature.recordset import RecordSet
+from ligature.update import coalesceSelectors
+
+
+class Recorder(object):
+	"""Listens in on notifications."""
+	up_to_date = True
+
+	def __init__(self):
+		self.updates = []
+
+	def update(self, old_selector, new_selector, source=None, depth=0):
+		self.updates.append((old_selector, new_selector))
+
+
+class BatchTestCase(unittest.TestCase):
+
+	def test_coalesce(self):
+
+		self.assertEqual(
+			coalesceSelectors([(None, slice(-1, None)), (None, slice(-3, None))]),
+			(None, slice(-4, None)) )
+
+		# a clear in the mix means everything changed
+		self.assertEqual(
+			coalesceSelectors([(None, slice(-1, None)), (slice(None, None), slice(None, None))]),
+			(slice(None, None), slice(None, None)) )
+
+
+	def test_batch(self):
+
+		srs = RecordSet(recordType='ab')
+		recorder = Recorder()
+		srs.subscribe(recorder)
+
+		with srs.batch():
+			srs.append([(1, 0)])
+			srs.append([(2, 0), (3, 0)])
+			with srs.batch():
+				srs.append([(4, 0)])
+			self.assertEqual(recorder.updates, [])
+		self.assertEqual(recorder.updates, [(None, slice(-3, None))])
+
+		# extending by groups is one update already
+		recorder.updates = []
+		srs.extend([[(5, 0)], [(6, 0)]])
+		self.assertEqual(recorder.updates, [(None, slice(-2, None))])
+
+		# extending by nothing is no update at all, so it can't widen a batch
+		recorder.updates = []
+		with srs.batch():
+			srs.append([(7, 0)])
+			srs.extend(RecordSet(recordType='ab'))
+		self.assertEqual(recorder.updates, [(None, slice(-1, None))])
+
+
+	def test_ordered(self):
+
+		srs = RecordSet(recordType='ab')
+		recorder = Recorder()
+		srs.subscribe(recorder)
+
+		with srs.batch(coalesce=False):
+			srs.append([(1, 0)])
+			srs.append([(2, 0)])
+			self.assertEqual(recorder.updates, [])
+		self.assertEqual(recorder.updates, [(None, slice(-1, None))] * 2)
+
+
+	def test_threads(self):
+
+		srs = RecordSet(recordType='ab')
+		recorder = Recorder()
+		srs.subscribe(recorder)
+
+		opened, appended = threading.Event(), threading.Event()
+		def batched():
+			with srs.batch():
+				srs.append([(1, 0)])
+				opened.set()
+				appended.wait(5)
+				srs.append([(3, 0)])
+		thread = threading.Thread(target=batched)
+		thread.start()
+
+		# another thread's batch doesn't hold (or flush) this one's notifications
+		opened.wait(5)
+		srs.append([(2, 0)])
+		self.assertEqual(recorder.updates, [(None, slice(-1, None))])
+		appended.set()
+		thread.join(5)
+
+		self.assertEqual(recorder.updates, [(None, slice(-1, None)), (None, slice(-2, None))])
+
+
+
+def runTests():
+	suite = unittest.TestLoader().loadTestsFromTestCase(BatchTestCase)
+	unittest.TextTestRunner(verbosity=2).run(suite)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
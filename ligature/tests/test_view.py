@@ -0,0 +1,124 @@
+import unittest
+
+from ligature.recordset import RecordSet, Retention
+from ligature.view import RecordSetView
+from ligature.storage import ColumnarGroup
+from ligature.examples import simpleRecordSet, simpleAddition
+
+from ligature.scanners.element import ElementScanner
+from ligature.calculations.sweep import Sweep
+
+
+class RecordSetViewTestCase(unittest.TestCase):
+
+	def test_bounds(self):
+
+		srs = RecordSet(simpleRecordSet)
+
+		view = RecordSetView(srs, 2, 7)
+		self.assertEqual([r.a for r in view], [3, 4, 5, 6, 7])
+		self.assertEqual(view.record_count, 5)
+		self.assertEqual(len(view), 3)
+		self.assertEqual(view[0].a, 3)
+		self.assertEqual(view[-1].a, 7)
+		self.assertEqual([r.a for r in view[1:4]], [4, 5, 6])
+		self.assertEqual([tuple(g) for g in view['a', :]], [(3, 4), (5, 6), (7,)])
+
+		# unclipped groups are the source's own
+		self.assertTrue(view._groups[1] is srs._groups[1])
+
+		view = RecordSetView.ofGroups(srs, 1, 2)
+		self.assertEqual([r.a for r in view], [5, 6])
+
+		# views of views stay within the outer bounds
+		inner = RecordSetView(RecordSetView(srs, 2, 7), 1, 10)
+		self.assertEqual([r.a for r in inner], [4, 5, 6, 7])
+
+
+	def test_projection(self):
+
+		for groupType in (None, ColumnarGroup):
+			srs = RecordSet(simpleRecordSet, groupType=groupType)
+			view = RecordSetView(srs, 1, 5, fields=('b',))
+
+			self.assertEqual(view._RecordType._fields, ('b',))
+			self.assertEqual([r._tuple for r in view], [(1,), (0,), (1,), (0,)])
+			self.assertEqual([v for v in ElementScanner(view, 'b')], [1, 0, 1, 0])
+			self.assertRaises(KeyError, ElementScanner, view, 'a')
+
+
+	def test_live(self):
+
+		srs = RecordSet(simpleRecordSet)
+		view = RecordSetView(srs, 4)
+		closed = RecordSetView(srs, 4, 6)
+
+		c = Sweep([view], lambda a, b: a + b, 'c')
+		self.assertEqual([r.c for r in c.results], [5, 7, 7, 9, 9])
+
+		srs.extend(simpleAddition)
+		self.assertEqual(view.record_count, 11)
+		self.assertEqual(closed.record_count, 2)
+		self.assertEqual([r.c for r in c.results][-6:], [12, 12, 14, 14, 16, 16])
+
+		self.assertRaises(NotImplementedError, view.append, [(1, 0)])
+
+
+	def test_truncation(self):
+
+		srs = RecordSet(recordType='ab', retention=Retention(maxGroups=1))
+		view = RecordSetView(srs)
+		scanner = ElementScanner(view, 'a')
+
+		srs.append([(1, 0)])
+		srs.append([(2, 0), (3, 0)])
+		# the view's scanner has not read anything yet
+		self.assertEqual(len(srs._groups), 2)
+
+		self.assertEqual([v for v in scanner], [1, 2, 3])
+		srs.append([(4, 0)])
+		self.assertEqual([g[0].a for g in srs._groups], [4])
+		self.assertEqual([r.a for r in view], [4])
+		self.assertEqual(scanner._group_cursor, 0)
+		self.assertEqual([v for v in scanner], [4])
+
+
+	def test_cached_bounds(self):
+
+		srs = RecordSet(simpleRecordSet, groupType=ColumnarGroup)
+		view = RecordSetView(srs, 2, fields=('a',))
+
+		# reads don't rebuild the clipped groups
+		self.assertTrue(view._groups is view._groups)
+		self.assertEqual(view._offsets, [0, 2, 4, 7])
+		self.assertEqual(tuple(view._groups[0].columnSlice(0, 1, 5)), (4,))
+
+		srs.extend(simpleAddition)
+		self.assertEqual(view._offsets, [0, 2, 4, 7, 10, 13])
+		self.assertEqual(tuple(view._groups[-1].columnSlice(0, 1, 3)), (15, 16))
+
+
+	def test_release(self):
+
+		srs = RecordSet(recordType='ab', retention=Retention(maxGroups=1))
+		view = RecordSetView(srs)
+
+		srs.append([(1, 0)])
+		srs.append([(2, 0)])
+		# nothing reads the view, but it still covers both groups
+		self.assertEqual(len(srs._groups), 2)
+
+		view.release()
+		srs.append([(3, 0)])
+		self.assertEqual([g[0].a for g in srs._groups], [3])
+
+
+
+def runTests():
+	suite = unittest.TestLoader().loadTestsFromTestCase(RecordSetViewTestCase)
+	unittest.TextTestRunner(verbosity=2).run(suite)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,4 +18,5 @@ class Transform(Composable):
     
     def _apply(self):
         self.transform()
-        self._needsUpdate = False
+        self._awaiting_apply = False
+        self._up_to_date = True
@@ -31,13 +31,16 @@ class Cluster(Transform):
             last_key_value = self._resultset._groups[-1][-1][self._key_field]
             
             # loop one: fill for continuity
+            continued = []
             for entry in self.scanners[0]:
                 if entry[self._key_field] == last_key_value:
-                    self._resultset._groups[-1] += (entry,)
+                    continued.append(entry)
                 else:
                     group = [entry]
                     last_key_value = entry[self._key_field]
                     break
+            if continued:
+                self._resultset._extendLastGroup(continued)
                 
         for entry in self.scanners[0]:
             if entry[self._key_field] == last_key_value:
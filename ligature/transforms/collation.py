@@ -1,6 +1,7 @@
 from ligature.recordset import RecordSet
 from ligature.scanners.record import RecordScanner
 from ligature.transform import Transform, Composable
+from ligature.record import genRecordType
 
 
 from heapq import heapify, heappush, heappop
@@ -31,7 +32,7 @@ class Collation(Transform):
                 
     def _resolveSources(self):
         
-        rawSources = [source.results if isinstance(source, Composable) else source
+        rawSources = [source._resultset if isinstance(source, Composable) else source
                       for source 
                       in self.sources]
             
@@ -73,7 +74,43 @@ class Collation(Transform):
         self._scanner_coverage = scanner_coverage
         
         self.scanners = tuple(scanners)
-        self._resultset = RecordSet(recordType=((self._key_field,) + self._target_fields + ((self._collation_field,) or tuple())))
+        RecordType = genRecordType(self._resultFields())
+        if getattr(self, '_resultset', None) is None:
+            self._resultset = RecordSet(recordType=RecordType)
+        elif self._resultset._RecordType._fields != RecordType._fields:
+            self._resultset._redefine(RecordType)
+
+    def _resultFields(self):
+        return (self._key_field,) + self._target_fields + ((self._collation_field,) if self._collation_field else tuple())
+
+    def requiredFields(self, source):
+        """Only the covered fields are read, along with the key and collation fields."""
+        sourceSet = source._resultset if isinstance(source, Composable) else source
+        for scanner, covered_fields in self._scanner_coverage.items():
+            if scanner.source is sourceSet:
+                return set(covered_fields).union(field 
+                                                 for field in (self._key_field, self._collation_field) 
+                                                 if field in sourceSet._RecordType._lookup)
+        return set()
+
+    def project(self, fields):
+        """Narrow the target fields. The key and collation fields are always kept.
+        Every source still gets scanned, even with none of its fields left,
+          since each of its records adds a row.
+        """
+        if self._resultset._groups:
+            return False
+        target_fields = tuple(field for field in self._target_fields if field in fields)
+        if len(target_fields) == len(self._target_fields):
+            return False
+        self._target_fields = target_fields
+        
+        self._scanner_coverage = dict((scanner, set(covered_fields).intersection(target_fields))
+                                      for scanner, covered_fields
+                                      in self._scanner_coverage.items())
+
+        self._resultset._redefine(genRecordType(self._resultFields()))
+        return True
     
     
     def transform(self):
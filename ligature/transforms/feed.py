@@ -2,12 +2,13 @@ from ligature.recordset import RecordSet
 from ligature.transform import Transform
 from ligature.compose import Composable
 from ligature.scanners.record import RecordScanner
+from ligature.record import genRecordType
 
 
 
 class Feed(Transform):
     
-    __slots__ = ('_key_fields', '_source_keys')
+    __slots__ = ('_key_fields', '_source_keys', '_projection')
 
     ScanClass = RecordScanner
     
@@ -20,6 +21,7 @@ class Feed(Transform):
         self.scanners = tuple()
         self._key_fields = key_fields
         self._source_keys = tuple()
+        self._projection = None
         
         if sources:
             for source in sources:
@@ -54,12 +56,31 @@ class Feed(Transform):
         self.scanners     = tuple(s for ix, s in enumerate(self.scanners)     if not ix in ix_to_remove)
         self._source_keys = tuple(k for ix, k in enumerate(self._source_keys) if not ix in ix_to_remove)
         
+    
+    def project(self, fields):
+        """Keep only the given renamed and key fields, by position."""
+        if self._resultset._groups:
+            return False
+        currentFields = self._resultset._RecordType._fields
+        keptIxs = tuple(ix for ix, field in enumerate(currentFields) if field in fields)
+        if len(keptIxs) == len(currentFields):
+            return False
+        if self._projection is not None:
+            keptIxs = tuple(self._projection[ix] for ix in keptIxs)
+        self._projection = keptIxs
+        self._resultset._redefine(genRecordType(field for field in currentFields if field in fields))
+        return True
         
     def transform(self):
+        
+        if self._projection is None:
+            project = lambda values: values
+        else:
+            project = lambda values, keptIxs=self._projection: tuple(values[ix] for ix in keptIxs)
                 
         self._resultset.extend(
             # use a generator to avoid adding empty entries
-            ( tuple(record) + tuple(getter(record) for getter in source_keys)
+            ( project(tuple(record) + tuple(getter(record) for getter in source_keys))
               for record in scanner)
             for scanner, source_keys 
             in zip(self.scanners, self._source_keys)
@@ -22,6 +22,13 @@ class LagBucket(Transform):
         self.scanners = (self.ScanClass(source),)
         self._lagRecords = []
         
+    def _checkpointState(self):
+        return [record._tuple for record in self._lagRecords]
+    
+    def _restoreState(self, state):
+        make = self._resultset._RecordType._make
+        self._lagRecords = [make(values) for values in state]
+        
     def transform(self):
         while len(self._lagRecords) < self._lag:
             self._lagRecords.append(next(self.scanners[0]))
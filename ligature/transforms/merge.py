@@ -1,4 +1,4 @@
-from ligature.scanners.element import ElementScanner
+from ligature.scanners.batch import BatchScanner, alignedBatches
 from ligature.transform import Transform
 from ligature.recordset import RecordSet
 from ligature.compose import Composable
@@ -12,18 +12,21 @@ class Merge(Transform):
     The new record type will have all the source columns,
       with the caveat that later sources win for overlaps.
     """
-    ScanClass = ElementScanner
+    __slots__ = ('_projection',)
+
+    ScanClass = BatchScanner
     
     def __init__(self, sources, *args, **kwargs):
         # Initialize mixins
         super(Merge, self).__init__(*args, **kwargs)
+        self._projection = None
         self.sources = tuple(sources)
         self._resolveSources()
         
     
     def _resolveSources(self):
         """Sources may overlap: if so, only take the latter."""        
-        rawSources = [source.results if isinstance(source, Composable) else source
+        rawSources = [source._resultset if isinstance(source, Composable) else source
                       for source 
                       in self.sources]
         
@@ -31,7 +34,18 @@ class Merge(Transform):
         # Gather all the fields
         for source in rawSources:
             for field in source._RecordType._fields:
-                allFields.append(field)
+                if self._projection is None or field in self._projection:
+                    allFields.append(field)
+        
+        # every source that supplies a field bounds how many rows there are,
+        #   so each keeps a scanner even once projection leaves it no fields
+        pacing = []
+        unclaimed = set(field for source in rawSources for field in source._RecordType._fields)
+        for source in reversed(rawSources):
+            owned = [field for field in source._RecordType._fields if field in unclaimed]
+            unclaimed.difference_update(owned)
+            if owned:
+                pacing.append((source, owned[0]))
         
         scanners = []
         sourceFields = set(allFields)
@@ -50,17 +64,45 @@ class Merge(Transform):
         # see https://stackoverflow.com/a/12814719/1943640
         scanners.sort(key=lambda entry: allFields.index(entry[0]))
         
+        scanned = set(id(scanner.source) for field, scanner in scanners)
         self.scanners = tuple(scanner 
                               for field,scanner 
-                              in scanners)
-        self._resultset = RecordSet(recordType=genRecordType(field 
-                                                             for field,scanner 
-                                                             in scanners))
+                              in scanners) + tuple(self.ScanClass(source, field)
+                                                   for source, field
+                                                   in reversed(pacing)
+                                                   if not id(source) in scanned)
+        RecordType = genRecordType(field 
+                                   for field,scanner 
+                                   in scanners)
+        if getattr(self, '_resultset', None) is None:
+            self._resultset = RecordSet(recordType=RecordType)
+        elif self._resultset._RecordType._fields != RecordType._fields:
+            self._resultset._redefine(RecordType)
+
+    def project(self, fields):
+        """Drop the scanners for fields no longer needed.
+        Sources left with no fields keep one scanner, so the rows still line up.
+        """
+        if self._resultset._groups:
+            return False
+        currentFields = self._resultset._RecordType._fields
+        keptFields = tuple(field for field in currentFields if field in fields)
+        # without any fields, the rows could not be made at all
+        if not keptFields or len(keptFields) == len(currentFields):
+            return False
+        self._projection = frozenset(keptFields)
+        self._resolveSources()
+        return True
         
     def transform(self):
         """Simply scan down the sources, generating new records."""
-        self._resultset.append( tuple(
-            self._resultset.coerceRecordType(newRecordValues)
-            for newRecordValues
-            in zip(*self.scanners)
-            ) )        
+        # scanners past the result's fields only pace the rows
+        width = len(self._resultset._RecordType._fields)
+        rows = []
+        for columns in alignedBatches(self.scanners):
+            # records of a single field are made from the bare values
+            if width == 1:
+                rows.extend(columns[0])
+            else:
+                rows.extend(zip(*columns[:width]))
+        self._resultset.append(rows)
@@ -1,6 +1,69 @@
+import threading
 from weakref import WeakSet
 
 
+def isTail(selector):
+    """True for selectors like slice(-3, None): the last few groups."""
+    return (    isinstance(selector, slice) 
+            and selector.start is not None and selector.start < 0 
+            and selector.stop is None and selector.step is None)
+
+
+def coalesceSelectors(notifications):
+    """Merge the (old, new) selectors of several notifications into one pair covering them all.
+    Appends add up into one slice of the last groups. Anything else widens 
+      to everything, which listeners already handle as a full refresh.
+    """
+    oldSelectors = [old for old, new in notifications if old is not None]
+    newSelectors = [new for old, new in notifications]
+    
+    if not oldSelectors:
+        old = None
+    elif all(selector == oldSelectors[0] for selector in oldSelectors):
+        old = oldSelectors[0]
+    else:
+        old = slice(None, None)
+        
+    if old is None and all(isTail(selector) for selector in newSelectors):
+        new = slice(sum(selector.start for selector in newSelectors), None)
+    elif all(selector == newSelectors[0] for selector in newSelectors):
+        new = newSelectors[0]
+    else:
+        new = slice(None, None)
+    
+    return old, new
+
+
+class Batch(object):
+    """Holds back an UpdateModel's notifications until the outermost batch ends.
+    If coalescing, listeners are then notified once with the selectors merged,
+      otherwise the notifications go out in the order they were made.
+    Batches belong to the thread that opened them, so only that thread's
+      notifications are held, and another thread's batch can't flush them.
+    """
+    __slots__ = ('_model', '_coalesce')
+    
+    def __init__(self, model, coalesce=True):
+        self._model = model
+        self._coalesce = coalesce
+        
+    def __enter__(self):
+        model = self._model
+        state = model._threadBatch()
+        if not state.depth:
+            state.coalesce = self._coalesce
+        state.depth += 1
+        return model
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        model = self._model
+        state = model._threadBatch()
+        state.depth -= 1
+        if not state.depth:
+            model._flush_batch()
+        return False
+
+
 class UpdateModel(object):
     """Provide the object with a way to notify other objects
       that depend on it.
@@ -9,6 +72,7 @@ class UpdateModel(object):
     # Slots ensures we're explicit and fast
     __slots__ = ('_sources', '_listeners', '_up_to_date',
                  '_metadata', '_notify_callback',
+                 '_batch_state',
                  '__weakref__')
     
     def __init__(self, metadata=None, notify_callback=None, *args, **kwargs):
@@ -25,6 +89,7 @@ class UpdateModel(object):
         self._metadata = metadata
         self._notify_callback = notify_callback
         self._up_to_date = True
+        self._batch_state = threading.local()
 
         # Initialize mixins
         super(UpdateModel, self).__init__(*args, **kwargs)
@@ -52,10 +117,43 @@ class UpdateModel(object):
         while listener in self._listeners:
             self._listeners.remove(listener)
     
+    def batch(self, coalesce=True):
+        """Use in a with block to hold notifications until it ends.
+        >>> with recordSet.batch():
+        ...     for group in groups:
+        ...         recordSet.append(group)
+        """
+        return Batch(self, coalesce)
+
+    def _threadBatch(self):
+        """The calling thread's batch: its depth, whether to coalesce, and the held notifications."""
+        state = self._batch_state
+        if not hasattr(state, 'depth'):
+            state.depth = 0
+            state.coalesce = True
+            state.held = []
+        return state
+
+    def _flush_batch(self):
+        state = self._threadBatch()
+        batched, state.held = state.held, []
+        if not batched:
+            return
+        if state.coalesce:
+            old_selector, new_selector = coalesceSelectors([(old, new) for old, new, source, depth in batched])
+            self.notify(old_selector, new_selector)
+        else:
+            for old_selector, new_selector, source, depth in batched:
+                self.notify(old_selector, new_selector, source, depth)
+    
     def notify(self, old_selector, new_selector, source=None, depth=0):
         """Fires an update to make sure dependents are updated, if needed.
         The selectors show what happened in the update.
         """
+        if getattr(self._batch_state, 'depth', 0):
+            self._batch_state.held.append((old_selector, new_selector, source, depth))
+            return
+        
         for dependent in self._listeners:
             try:
                 # TODO: verify that for each update, only one update is marshalled and fired
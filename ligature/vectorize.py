@@ -0,0 +1,212 @@
+"""
+    Evaluate Expressions over whole columns at once with NumPy
+
+    Only Expressions built from arithmetic and comparison operators
+      and math functions qualify. Anything else (or a missing NumPy,
+      as in Jython) means the calculation keeps evaluating row by row.
+
+    The results must match the row path. NumPy overflows and divides by
+      zero quietly where Python raises or promotes, so a batch that hits
+      a floating point error, a negative integer power, or integer
+      overflow is evaluated row by row instead. So is a batch with columns
+      that aren't plain numbers, or that mix ints and floats (NumPy would
+      make them all floats).
+"""
+from __future__ import with_statement
+
+import tokenize
+from ast import literal_eval
+from array import array
+
+from ligature.expression import Expression
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+__copyright__ = """Copyright (C) 2020 Corso Systems"""
+__license__ = 'Apache 2.0'
+__maintainer__ = 'Andrew Geiger'
+__email__ = 'andrew.geiger@corsosystems.com'
+
+__all__ = ['vectorize']
+
+
+if numpy is not None:
+
+    vectorized_operators = {
+        '+' : numpy.add,
+        '-' : numpy.subtract,
+        '*' : numpy.multiply,
+        '/' : numpy.true_divide, # see PEP 238
+        '//': numpy.floor_divide,
+        '%' : numpy.mod,
+        '**': numpy.power,
+        '<' : numpy.less,
+        '<=': numpy.less_equal,
+        '==': numpy.equal,
+        '!=': numpy.not_equal,
+        '>=': numpy.greater_equal,
+        '>' : numpy.greater,
+    }
+
+    # math function name: (ufunc, number of arguments)
+    vectorized_math_functions = {
+        'sin': (numpy.sin, 1), 'cos': (numpy.cos, 1), 'tan': (numpy.tan, 1),
+        'asin': (numpy.arcsin, 1), 'acos': (numpy.arccos, 1), 'atan': (numpy.arctan, 1),
+        'atan2': (numpy.arctan2, 2), 'hypot': (numpy.hypot, 2),
+        'sinh': (numpy.sinh, 1), 'cosh': (numpy.cosh, 1), 'tanh': (numpy.tanh, 1),
+        'asinh': (numpy.arcsinh, 1), 'acosh': (numpy.arccosh, 1), 'atanh': (numpy.arctanh, 1),
+        'exp': (numpy.exp, 1), 'expm1': (numpy.expm1, 1),
+        'log': (numpy.log, 1), 'log10': (numpy.log10, 1), 'log1p': (numpy.log1p, 1),
+        'sqrt': (numpy.sqrt, 1), 'pow': (numpy.float_power, 2),
+        'fabs': (numpy.fabs, 1), 'floor': (numpy.floor, 1), 'ceil': (numpy.ceil, 1),
+        'fmod': (numpy.fmod, 2), 'copysign': (numpy.copysign, 2),
+        'degrees': (numpy.degrees, 1), 'radians': (numpy.radians, 1),
+    }
+
+    vectorized_math_constants = {
+        'pi': numpy.pi,
+        'e': numpy.e,
+    }
+
+
+class NotVectorizable(ValueError):
+    """The expression uses something that has no whole-column equivalent."""
+
+
+# steps of the vectorized program
+ARGUMENT, CONSTANT, CALL = range(3)
+
+
+def _plan(postfixStack, fields):
+    """Walk the postfix stack like Expression does, but only note what to run.
+    Returns the list of steps for a small stack machine over arrays.
+    """
+    program = []
+    # symbolic stack: ('module',) / ('name', attribute) / ('value', width)
+    stack = []
+
+    for ix, (tokenType, token) in enumerate(postfixStack):
+
+        if tokenType == tokenize.NAME:
+            attributeNext = (    ix + 1 < len(postfixStack)
+                             and postfixStack[ix + 1] == (tokenize.OP, '.'))
+            if token == 'math':
+                stack.append(('module',))
+            elif attributeNext:
+                stack.append(('name', token))
+            elif token in fields:
+                program.append((ARGUMENT, fields.index(token)))
+                stack.append(('value', 1))
+            else:
+                raise NotVectorizable('Name "%s" is not an argument or math function' % token)
+
+        elif tokenType == tokenize.NUMBER:
+            program.append((CONSTANT, literal_eval(token)))
+            stack.append(('value', 1))
+
+        elif tokenType == tokenize.OP and token == '.':
+            (_, attribute), operand = stack.pop(), stack.pop()
+            # math.pi
+            if operand[0] == 'module' and attribute in vectorized_math_constants:
+                program.append((CONSTANT, vectorized_math_constants[attribute]))
+                stack.append(('value', 1))
+            # math.sin(x) comes through as math, x, sin, .
+            elif (    operand[0] == 'value' and stack and stack[-1][0] == 'module'
+                  and vectorized_math_functions.get(attribute, (None, 0))[1] == operand[1]):
+                _ = stack.pop()
+                program.append((CALL, vectorized_math_functions[attribute][0], operand[1]))
+                stack.append(('value', 1))
+            else:
+                raise NotVectorizable('Attribute "%s" has no vectorized equivalent' % attribute)
+
+        elif tokenType == tokenize.OP and token == ',':
+            # only function arguments get gathered - they stay on the stack when run
+            right, left = stack.pop(), stack.pop()
+            if not (left[0] == 'value' and right[0] == 'value'):
+                raise NotVectorizable('Tuples are not vectorized')
+            stack.append(('value', left[1] + right[1]))
+
+        elif tokenType == tokenize.OP and token in vectorized_operators:
+            right, left = stack.pop(), stack.pop()
+            if not (left == ('value', 1) and right == ('value', 1)):
+                raise NotVectorizable('Operator "%s" needs two values' % token)
+            program.append((CALL, vectorized_operators[token], 2))
+            stack.append(('value', 1))
+
+        else:
+            raise NotVectorizable('Token "%s" has no vectorized equivalent' % token)
+
+    if not stack == [('value', 1)]:
+        raise NotVectorizable('Expression does not resolve to a single value')
+
+    return program
+
+
+def _uniform(column):
+    """True if every value in the column is of the same type, so NumPy won't convert any."""
+    if isinstance(column, array):
+        return True
+    return len(set(map(type, column))) <= 1
+
+
+def vectorize(function):
+    """Returns a function that evaluates the Expression over whole columns in one call.
+    The result is a list, one entry per row, just like calling the Expression per row.
+    If the function can not be vectorized, None is returned instead.
+
+    >>> vectorize(Expression('a * 2 + b'))([1,2,3], [0,1,0])
+    [2, 5, 6]
+    """
+    if numpy is None or not isinstance(function, Expression) or not function._fields:
+        return None
+
+    try:
+        # an expression that didn't resolve fully can fail anywhere in here
+        program = _plan(function._postfix, function._fields)
+    except (NotVectorizable, IndexError, ValueError):
+        return None
+
+    def run(arrays):
+        stack = []
+        for step in program:
+            if step[0] == ARGUMENT:
+                stack.append(arrays[step[1]])
+            elif step[0] == CONSTANT:
+                stack.append(step[1])
+            else:
+                _, ufunc, argCount = step
+                arguments = stack[-argCount:]
+                del stack[-argCount:]
+                stack.append(ufunc(*arguments))
+        return numpy.asarray(stack.pop())
+
+    def vectorized(*columns):
+        if not all(_uniform(column) for column in columns):
+            return [function(*row) for row in zip(*columns)]
+        arrays = [numpy.asarray(column) for column in columns]
+        if not all(array.dtype.kind in 'biuf' for array in arrays):
+            return [function(*row) for row in zip(*columns)]
+        try:
+            with numpy.errstate(all='raise'):
+                result = run(arrays)
+                # integer math wraps around silently, so check it against floats
+                #   (exact until 2**53, and a wrapped value is off by far more than that)
+                if any(array.dtype.kind in 'iu' for array in arrays):
+                    shadow = run([array.astype(float) for array in arrays])
+                    if numpy.any(numpy.abs(result.astype(float) - shadow.astype(float))
+                                 > numpy.abs(shadow) * 1e-9 + 1):
+                        raise OverflowError('Integer overflow in vectorized expression')
+        # let the row path give the answer (or raise the error) Python would
+        except (ArithmeticError, ValueError, TypeError, AttributeError):
+            return [function(*row) for row in zip(*columns)]
+
+        # constants broadcast over the rows
+        if result.ndim == 0:
+            return [result.item()] * len(arrays[0])
+        return result.tolist()
+
+    return vectorized
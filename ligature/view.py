@@ -0,0 +1,263 @@
+"""
+    Views onto part of a RecordSet
+
+    A view holds only its bounds and reads through to the RecordSet
+      it came from, so a range of records (or groups, or just some
+      of the fields) can be handed around without copying them.
+      Scanners and Calculations take a view like any other RecordSet.
+"""
+
+from weakref import WeakSet
+
+from ligature.recordset import RecordSet, RecordSetColumn
+from ligature.record import genRecordType
+from ligature.update import UpdateModel
+from ligature.storage import GroupView
+
+
+__copyright__ = """Copyright (C) 2020 Corso Systems"""
+__license__ = 'Apache 2.0'
+__maintainer__ = 'Andrew Geiger'
+__email__ = 'andrew.geiger@corsosystems.com'
+
+__all__ = ['RecordSetView']
+
+
+class RecordSetView(RecordSet):
+    """The records of a RecordSet from the start up to (but not including) the stop record index.
+    Without a stop, the view stays open and includes whatever gets added to the source.
+    Given fields, the view's records only have those fields.
+
+    Groups are the source's groups, clipped to the bounds. Bounds are kept
+      relative to everything ever added to the source, so they still hold
+      after the source truncates. Views keep what they cover from being
+      truncated until any scanners on the view have read it. A view with
+      no scanners keeps all of it for as long as the view is around
+      (an open view, everything from its start on) - release the view
+      once it is no longer read to let the source truncate past it.
+    """
+    __slots__ = ('_source', '_start', '_stop', '_firstGroup', '_fieldIxs', '_clipped')
+
+    def __init__(self, source, start=0, stop=None, fields=None, *args, **kwargs):
+        # a view of a view is a view of the original
+        if isinstance(source, RecordSetView):
+            offset = source._relativeStart
+            if source._stop is not None:
+                limit = source._relativeStop - offset
+                stop = limit if stop is None else min(stop, limit)
+            if fields and source._fieldIxs is not None:
+                fields = tuple(source._source._RecordType._fields[source._fieldIxs[source._RecordType._lookup[field]]]
+                               for field in fields)
+            elif not fields and source._fieldIxs is not None:
+                fields = source._RecordType._fields
+            start += offset
+            stop = None if stop is None else stop + offset
+            source = source._source
+
+        self._source = source
+        self._start = source._removedRecords + start
+        self._stop = None if stop is None else source._removedRecords + stop
+        if start < source.record_count:
+            self._firstGroup = source._locate(start)[0] + source._removedGroups
+        else:
+            self._firstGroup = len(source._groups) + source._removedGroups
+
+        if fields:
+            self._fieldIxs = tuple(source._RecordType._lookup[field] for field in fields)
+            self._RecordType = genRecordType(fields)
+        else:
+            self._fieldIxs = None
+            self._RecordType = source._RecordType
+
+        self._GroupType = source._GroupType
+        self._retention = None
+        self._sortKey = None
+        self._indexes = {}
+        self._scanners = WeakSet()
+        self._removedGroups = 0
+        self._removedRecords = 0
+        self._lock = source._lock
+        self._clipped = None
+        self._columns = tuple(RecordSetColumn(self, ix)
+                              for ix
+                              in range(len(self._RecordType._fields)))
+
+        # Initialize mixins (skipping RecordSet - the data is the source's)
+        UpdateModel.__init__(self, *args, **kwargs)
+
+        source.subscribe(self)
+        source._attachScanner(self)
+
+    @classmethod
+    def ofGroups(cls, source, first=0, last=None, fields=None):
+        """A view of the source's groups from first up to (but not including) last."""
+        offsets = source._offsets
+        return cls(source, offsets[first], None if last is None else offsets[last], fields)
+
+    @property
+    def source(self):
+        return self._source
+
+    @property
+    def _relativeStart(self):
+        return max(0, self._start - self._source._removedRecords)
+
+    @property
+    def _relativeStop(self):
+        count = self._source.record_count
+        if self._stop is None:
+            return count
+        return max(self._relativeStart, min(count, self._stop - self._source._removedRecords))
+
+    def _project(self, record):
+        if self._fieldIxs is None:
+            return record
+        values = record._tuple
+        return self._RecordType._make(tuple([values[ix] for ix in self._fieldIxs]))
+
+    def _clipGroups(self):
+        start, stop = self._relativeStart, self._relativeStop
+        if start >= stop:
+            return []
+        source = self._source
+        firstGix, firstRix = source._locate(start)
+        lastGix, lastRix = source._locate(stop - 1)
+
+        groups = []
+        for gix in range(firstGix, lastGix + 1):
+            group = source._groups[gix]
+            groupStart = firstRix if gix == firstGix else 0
+            groupStop = lastRix + 1 if gix == lastGix else len(group)
+            if groupStart == 0 and groupStop == len(group) and self._fieldIxs is None:
+                groups.append(group)
+            else:
+                groups.append(GroupView(self._RecordType, group, groupStart, groupStop, self._fieldIxs))
+        return groups
+
+    def _bounds(self):
+        """The clipped groups and their offsets, only rebuilt once the source changes.
+        Notifications and truncation drop them, but the source's extent is checked
+          too, since restoring (or a batch still holding its notifications) does not notify.
+        """
+        self._lock.acquire()
+        try:
+            source = self._source
+            extent = (id(source._groups), source._removedRecords, source.record_count)
+            if self._clipped is None or self._clipped[0] != extent:
+                groups = self._clipGroups()
+                offsets = [0]
+                for group in groups:
+                    offsets.append(offsets[-1] + len(group))
+                self._clipped = (extent, groups, offsets)
+            return self._clipped
+        finally:
+            self._lock.release()
+
+    @property
+    def _groups(self):
+        return self._bounds()[1]
+
+    @property
+    def _offsets(self):
+        return self._bounds()[2]
+
+    @property
+    def record_count(self):
+        return self._relativeStop - self._relativeStart
+
+    @property
+    def records(self):
+        project = self._project
+        return (project(record)
+                for record
+                in self._source._iterSlice(self._relativeStart, self._relativeStop, 1))
+
+    def __getitem__(self, selector):
+        """Records are selected by their index in the view."""
+        if isinstance(selector, tuple):
+            column, slicer = selector
+            return self.column(column)[slicer]
+        elif isinstance(selector, slice):
+            start, stop, step = selector.indices(self.record_count)
+            offset = self._relativeStart
+            project = self._project
+            return (project(record)
+                    for record
+                    in self._source._iterSlice(offset + start, offset + stop, step))
+        elif isinstance(selector, (int, long)):
+            index = selector
+            if index < 0:
+                index += self.record_count
+            if not 0 <= index < self.record_count:
+                raise IndexError("There are not enough records in the view to meet the index %d" % selector)
+            return self._project(self._source[self._relativeStart + index])
+        else:
+            raise NotImplementedError("The selector '%r' is not implemented" % selector)
+
+    # Truncation cooperation, as the source sees it
+
+    @property
+    def firstNeededGroup(self):
+        """The first of the source's groups this view still needs.
+        Without scanners, that is the first group the view covers.
+        """
+        first = max(0, self._firstGroup - self._source._removedGroups)
+        scanners = list(self._scanners)
+        if scanners:
+            first += min(scanner.firstNeededGroup for scanner in scanners)
+        return first
+
+    def updateCursorsForRemoval(self, groupCount):
+        """The source dropped groups, so any of this view's are gone for its scanners too."""
+        first = max(0, self._firstGroup - (self._source._removedGroups - groupCount))
+        lost = groupCount - first
+        self._clipped = None
+        if lost > 0:
+            for scanner in list(self._scanners):
+                scanner.updateCursorsForRemoval(lost)
+
+    def release(self):
+        """Stop following the source, so it no longer keeps the view's groups from truncation.
+        What remains readable afterwards is whatever the source has not yet dropped.
+        """
+        self._source.unsubscribe(self)
+        self._source._scanners.discard(self)
+
+    def truncate(self, groupCount=None):
+        """Views hold no data of their own, so there is nothing to truncate."""
+        return 0
+
+    def checkpoint(self):
+        """Views hold no data of their own, so only their bounds are kept.
+        The RecordSet they view is checkpointed on its own (see ligature.checkpoint).
+        """
+        return {
+            'start': self._start,
+            'stop': self._stop,
+            'firstGroup': self._firstGroup,
+        }
+
+    def restore(self, state):
+        """Put the bounds back. The viewed RecordSet should be restored first."""
+        self._start = state['start']
+        self._stop = state['stop']
+        self._firstGroup = state['firstGroup']
+        self._clipped = None
+
+    # Updates pass through from the source
+
+    def update(self, old_selector, new_selector, source=None, depth=0):
+        self._clipped = None
+        # a closed view only changes when the source is cleared
+        if old_selector or self._stop is None:
+            self.notify(old_selector, new_selector, source or self, depth)
+
+    # Read only
+
+    def _readOnly(self, *args, **kwargs):
+        raise NotImplementedError("RecordSetViews are read only. Change the RecordSet they view instead.")
+
+    append = extend = clear = addIndex = _extendLastGroup = _readOnly
+
+    def __str__(self):
+        return 'RecordSetView=%r' % repr(self._RecordType._fields)
\ No newline at end of file